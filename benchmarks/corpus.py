@@ -0,0 +1,65 @@
+"""벤치마크용 한글 릴리즈 파일명 생성
+
+``benchmarks.similarity.TITLES`` 의 작품으로 방송, 드라마, 해외 시리즈, 영화에서
+흔히 쓰는 형식의 파일명을 만듭니다.
+"""
+
+import random
+
+from benchmarks.similarity import TITLES
+
+RELEASE_GROUPS = ("NEXT", "F1RST", "SW", "ST", "WITH", "HANrel", "DOSO")
+QUALITIES = ("1080p", "720p", "2160p", "1080p.WEB-DL", "720p.HDTV")
+CODECS = ("H.264", "H264", "x264", "HEVC", "H.265")
+EXTENSIONS = ("mkv", "mp4", "ts")
+
+
+def dotted(title: str) -> str:
+    return ".".join(title.replace(":", "").replace("?", "").split())
+
+
+def release_name(rnd: random.Random) -> str:
+    ko, en, year = rnd.choice(TITLES)
+    episode = rnd.randint(1, 200)
+    date = f"{rnd.randint(10, 24):02d}{rnd.randint(1, 12):02d}{rnd.randint(1, 28):02d}"
+    quality = rnd.choice(QUALITIES)
+    group = rnd.choice(RELEASE_GROUPS)
+    ext = rnd.choice(EXTENSIONS)
+    match rnd.randrange(6):
+        case 0:
+            # 국내 방송
+            return f"{dotted(ko)}.E{episode:02d}.{date}.{quality}-{group}.{ext}"
+        case 1:
+            return f"{dotted(ko)}.E{episode:02d}.{date}.{quality}.H264.AAC-{group}.{ext}"
+        case 2:
+            # 뉴스, 일일 방송
+            return f"{dotted(ko)}.{date}.{quality}-{group}.{ext}"
+        case 3:
+            # OTT 시리즈
+            season = rnd.randint(1, 3)
+            return (
+                f"{dotted(en)}.S{season:02d}E{episode % 20 + 1:02d}.{quality}"
+                f".NF.WEB-DL.DDP5.1.{rnd.choice(CODECS)}-{group}.{ext}"
+            )
+        case 4:
+            # 영화
+            return f"{dotted(ko)}.{year}.{quality}.KORSUB.WEBRip.{rnd.choice(CODECS)}.AAC.{ext}"
+        case _:
+            return f"{ko} {year} {quality} WEB-DL {rnd.choice(CODECS)} AAC-{group}.{ext}"
+
+
+def release_names(rnd: random.Random, count: int) -> list[str]:
+    return [release_name(rnd) for _ in range(count)]
+
+
+def release_path(rnd: random.Random) -> str:
+    ko, _, year = rnd.choice(TITLES)
+    root = rnd.choice(
+        (
+            "/ROOT/GDRIVE/VOD/방송중/드라마",
+            "/ROOT/GDRIVE/VOD/방송중/예능",
+            "/ROOT/GDRIVE/MOVIE/최신",
+            "/ROOT/GDRIVE/FTV/미드",
+        )
+    )
+    return f"{root}/{ko} ({year})/{release_name(rnd)}"
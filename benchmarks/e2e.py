@@ -0,0 +1,363 @@
+"""방송 API 부터 디스코드 전송까지의 처리량 벤치마크
+
+봇의 API 서버, 대기열, 작업 태스크를 디스코드 로그인 없이 실행하고
+``/api/broadcasts/gds`` 와 ``/api/broadcasts/downloader`` 에 목표 속도로 요청을 보냅니다.
+메타데이터는 ``benchmarks.stubs`` 의 스텁 서버가, 전송은 가짜 채널이 받습니다.
+
+    python -m benchmarks.e2e [--rate 2] [--duration 10] [--profile normal]
+    python -m benchmarks.e2e --rate 20 --duration 30 --send-rate 50 --send-per 1
+
+처리량, 시간별 대기열 깊이, 요청부터 모든 채널에 전송될 때까지의
+p50/p95/p99 지연 시간을 출력합니다. ``--settings`` 로 실제 설정 파일을 지정해도
+저널, spill, 캐시 파일 경로는 비워서 운영 데이터를 건드리지 않습니다.
+"""
+
+import os
+import json
+import time
+import random
+import socket
+import asyncio
+import logging
+import argparse
+from collections import Counter
+from dataclasses import asdict
+from typing import Any
+
+import aiohttp
+import discord
+
+from flaskfarmaider_bot.bot import FlaskfarmaiderBot
+from flaskfarmaider_bot.models import AppSettings
+from benchmarks.similarity import TITLES
+from benchmarks.stubs import FakeDiscord, FlaskfarmStub, add_profile_arguments, get_profile
+
+APIKEY = "benchmark"
+ENCRYPT_KEY = "0123456789abcdef0123456789abcdef"
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def rank(q: float) -> float:
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    return {
+        "p50": round(rank(0.50), 4),
+        "p95": round(rank(0.95), 4),
+        "p99": round(rank(0.99), 4),
+        "max": round(ordered[-1], 4),
+    }
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        handler, _, weight = part.partition("=")
+        if handler.strip() not in ("gds", "downloader"):
+            raise argparse.ArgumentTypeError(f"Unknown handler: {handler}")
+        mix[handler.strip()] = float(weight or 1)
+    return mix
+
+
+class Recorder:
+    """요청 시각과 채널별 전송 시각을 짝지어 지연 시간을 기록
+
+    요청마다 고유한 gds 경로 또는 다운로더 item 을 넣고
+    전송된 메시지를 복호화해서 어떤 요청인지 찾습니다.
+    """
+
+    def __init__(self, bot: FlaskfarmaiderBot, fanout: int) -> None:
+        self.bot = bot
+        self.fanout = fanout
+        self.started: dict[str, float] = {}
+        self.remaining: dict[str, int] = {}
+        self.accept_latencies: list[float] = []
+        self.send_latencies: list[float] = []
+        self.statuses: Counter[str] = Counter()
+        self.messages = 0
+        self.unknown = 0
+        self.last_sent = 0.0
+        self.all_sent = asyncio.Event()
+
+    def request(self, marker: str) -> None:
+        self.started[marker] = time.monotonic()
+        self.remaining[marker] = self.fanout
+        self.all_sent.clear()
+
+    def response(self, marker: str, status: int | str) -> None:
+        self.statuses[str(status)] += 1
+        if status == 204:
+            self.accept_latencies.append(time.monotonic() - self.started[marker])
+        elif self.remaining.pop(marker, None) is not None and not self.remaining:
+            self.all_sent.set()
+
+    def on_send(self, channel_id: int, content: str) -> None:
+        now = time.monotonic()
+        self.messages += 1
+        self.last_sent = now
+        marker = self.get_marker(content)
+        if marker not in self.remaining:
+            self.unknown += 1
+            return
+        self.remaining[marker] -= 1
+        if self.remaining[marker] > 0:
+            return
+        del self.remaining[marker]
+        self.send_latencies.append(now - self.started[marker])
+        if not self.remaining:
+            self.all_sent.set()
+
+    def get_marker(self, content: str) -> str:
+        encrypted = content.removeprefix("```^").removesuffix("```")
+        service = self.bot.broadcast_service
+        decrypted = service.decrypt(encrypted, self.bot.settings.broadcast.encrypt.key)
+        data = json.loads(decrypted).get("data") or {}
+        return str(data.get("gds_path") or data.get("id") or data.get("folderid") or "")
+
+
+class Workload:
+    """고유한 경로의 방송 요청 생성"""
+
+    def __init__(self, mix: dict[str, float], titles: int, rng: random.Random) -> None:
+        self.handlers = list(mix)
+        self.weights = list(mix.values())
+        self.titles = TITLES[: max(titles, 1)]
+        self.random = rng
+        self.count = 0
+
+    def next(self) -> tuple[str, dict[str, Any], str]:
+        self.count += 1
+        handler = self.random.choices(self.handlers, self.weights)[0]
+        title, _, year = self.random.choice(self.titles)
+        episode = self.count % 999 + 1
+        filename = f"{title}.E{episode:03d}.240101.1080p-BENCH{self.count}.mkv"
+        path = f"/ROOT/GDRIVE/VOD/방송중/드라마/{title} ({year})/{filename}"
+        if handler == "gds":
+            return handler, {"path": path, "mode": "ADD", "file_count": 1}, path
+        item = f"bench-{self.count}"
+        return handler, {"path": path, "item": item, "file_count": 1}, item
+
+
+def make_settings(args: argparse.Namespace, stub_url: str) -> AppSettings:
+    overrides: dict[str, Any] = {
+        "discord": {},
+        "api": {"host": "127.0.0.1", "port": args.port, "keys": [APIKEY]},
+        "flaskfarm": {"url": stub_url, "apikey": APIKEY},
+        "broadcast": {
+            "source": {},
+            "target": {"channels": list(range(1, args.channels + 1))},
+            "encrypt": {"key": ENCRYPT_KEY},
+            "queue": {"journal": "", "spill": ""},
+            "metadata_cache": {"path": ""},
+            "title_index": {"path": "", "catalogs": []},
+        },
+    }
+    send: dict[str, Any] = {"dead_letter": ""}
+    if args.send_rate is not None:
+        send["rate"] = args.send_rate
+    if args.send_per is not None:
+        send["per"] = args.send_per
+    overrides["discord"]["send"] = send
+    if args.workers is not None:
+        overrides["broadcast"]["queue"]["workers"] = args.workers
+    return AppSettings(user_yaml_file=args.settings or os.devnull, **overrides)
+
+
+async def drive(
+    args: argparse.Namespace, recorder: Recorder, workload: Workload
+) -> float:
+    """목표 속도로 요청을 보내고(응답을 기다리지 않음) 실제 요청 속도를 반환"""
+    base_url = f"http://127.0.0.1:{args.port}/api/broadcasts"
+    connector = aiohttp.TCPConnector(limit=args.connections)
+    async with aiohttp.ClientSession(connector=connector) as session:
+
+        async def post(handler: str, data: dict, marker: str) -> None:
+            recorder.request(marker)
+            try:
+                async with session.post(
+                    f"{base_url}/{handler}", json=data, headers={"x-apikey": APIKEY}
+                ) as response:
+                    await response.read()
+                    status: int | str = response.status
+            except Exception as e:
+                status = type(e).__name__
+            recorder.response(marker, status)
+
+        tasks = set()
+        started = time.monotonic()
+        interval = 1 / args.rate
+        while (at := started + len(tasks) * interval) < started + args.duration:
+            if (delay := at - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+            tasks.add(asyncio.create_task(post(*workload.next())))
+        elapsed = time.monotonic() - started
+        await asyncio.gather(*tasks)
+    return len(tasks) / elapsed if elapsed else 0.0
+
+
+async def sample_depth(
+    bot: FlaskfarmaiderBot, interval: float, samples: list[tuple[float, int, int]]
+) -> None:
+    started = time.monotonic()
+    while True:
+        pending = sum(
+            stats["pending"] + stats["retrying"]
+            for stats in bot.send_scheduler.stats().values()
+        )
+        samples.append(
+            (round(time.monotonic() - started, 3), bot.broadcast_queue.qsize(), pending)
+        )
+        await asyncio.sleep(interval)
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    stub = FlaskfarmStub(get_profile(args), seed=args.seed)
+    stub_url = await stub.start()
+    args.port = args.port or get_free_port()
+    settings = make_settings(args, stub_url)
+    bot = FlaskfarmaiderBot(
+        command_prefix="!", settings=settings, intents=discord.Intents.default()
+    )
+    channels = settings.broadcast.target.channels
+    recorder = Recorder(bot, len(channels))
+    fake_discord = FakeDiscord(
+        channels,
+        latency=args.send_latency,
+        ratelimit_rate=args.ratelimit_rate,
+        on_send=recorder.on_send,
+        seed=args.seed,
+    )
+    bot.send_scheduler.resolver = fake_discord.get_channel
+    samples: list[tuple[float, int, int]] = []
+    sampler = None
+    try:
+        await bot.setup_hook()
+        sampler = asyncio.create_task(sample_depth(bot, args.sample_interval, samples))
+        started = time.monotonic()
+        offered_rate = await drive(
+            args, recorder, Workload(args.mix, args.titles, random.Random(args.seed))
+        )
+        try:
+            await asyncio.wait_for(recorder.all_sent.wait(), args.drain_timeout)
+        except asyncio.TimeoutError:
+            pass
+        elapsed = (recorder.last_sent or time.monotonic()) - started
+    finally:
+        if sampler:
+            sampler.cancel()
+        await bot.close()
+        await stub.stop()
+    delivered = len(recorder.send_latencies)
+    depths = [depth for _, depth, _ in samples] or [0]
+    return {
+        "config": {
+            "rate": args.rate,
+            "duration": args.duration,
+            "mix": args.mix,
+            "channels": len(channels),
+            "profile": asdict(get_profile(args)),
+            "send_rate": settings.discord.send.rate,
+            "send_per": settings.discord.send.per,
+            "workers": settings.broadcast.queue.workers,
+        },
+        "requests": {
+            "total": sum(recorder.statuses.values()),
+            "offered_rate": round(offered_rate, 2),
+            "statuses": dict(recorder.statuses),
+        },
+        "delivered": delivered,
+        "undelivered": len(recorder.remaining),
+        "unknown_messages": recorder.unknown,
+        "elapsed": round(elapsed, 3),
+        "throughput": {
+            "jobs_per_s": round(delivered / elapsed, 2) if elapsed > 0 else 0.0,
+            "messages_per_s": round(recorder.messages / elapsed, 2) if elapsed > 0 else 0.0,
+        },
+        "latency": {
+            "accept": percentiles(recorder.accept_latencies),
+            "send": percentiles(recorder.send_latencies),
+        },
+        "queue_depth": {
+            "max": max(depths),
+            "mean": round(sum(depths) / len(depths), 2),
+            "samples": samples,
+        },
+        "stub": stub.stats(),
+        "discord": fake_discord.stats(),
+    }
+
+
+def print_report(report: dict[str, Any], rows: int) -> None:
+    config, requests = report["config"], report["requests"]
+    print(
+        f"rate: {config['rate']}/s for {config['duration']}s mix={config['mix']} "
+        f"channels={config['channels']} send={config['send_rate']}/{config['send_per']}s"
+    )
+    print(f"profile: {config['profile']}")
+    print(
+        f"requests: {requests['total']} ({requests['offered_rate']}/s) statuses={requests['statuses']}"
+    )
+    print(
+        f"delivered: {report['delivered']} undelivered: {report['undelivered']} "
+        f"in {report['elapsed']}s"
+    )
+    throughput = report["throughput"]
+    print(
+        f"throughput: {throughput['jobs_per_s']} jobs/s, {throughput['messages_per_s']} messages/s"
+    )
+    for name, values in report["latency"].items():
+        print(f"latency {name}: " + " ".join(f"{k}={v:.3f}s" for k, v in values.items()))
+    depth = report["queue_depth"]
+    print(f"queue depth: max={depth['max']} mean={depth['mean']}")
+    samples = depth["samples"]
+    step = max(len(samples) // max(rows, 1), 1)
+    print("  time(s)  queue  sending")
+    for at, queued, pending in samples[::step]:
+        print(f"  {at:7.2f}  {queued:5d}  {pending:7d}")
+    print(f"stub: {report['stub']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=2.0, help="초당 요청 수")
+    parser.add_argument("--duration", type=float, default=10.0, help="요청을 보내는 시간(초)")
+    parser.add_argument(
+        "--mix", type=parse_mix, default="gds=1,downloader=1", help="방송 종류별 비중"
+    )
+    parser.add_argument("--titles", type=int, default=len(TITLES), help="사용할 작품 수")
+    parser.add_argument("--channels", type=int, default=2, help="전송 채널 수")
+    parser.add_argument("--send-rate", type=int, help="채널별 전송 제한 (기본: 설정값)")
+    parser.add_argument("--send-per", type=float, help="전송 제한 시간 단위(초)")
+    parser.add_argument("--send-latency", type=float, default=0.05, help="가짜 채널 전송 지연(초)")
+    parser.add_argument("--ratelimit-rate", type=float, default=0.0, help="429 응답 확률")
+    parser.add_argument("--workers", type=int, help="방송 작업 태스크 수 (기본: 설정값)")
+    parser.add_argument("--connections", type=int, default=100, help="API 동시 연결 수")
+    parser.add_argument("--sample-interval", type=float, default=0.25, help="대기열 측정 간격(초)")
+    parser.add_argument("--drain-timeout", type=float, default=120.0, help="전송 완료 대기 시간(초)")
+    parser.add_argument("--port", type=int, default=0, help="봇 API 포트 (기본: 빈 포트)")
+    parser.add_argument("--settings", help="기본값으로 사용할 설정 파일")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeline", type=int, default=20, help="출력할 대기열 측정 줄 수")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--log-level", default="CRITICAL", help="봇 로그 수준")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level.upper())
+    report = asyncio.run(run(args))
+    print_report(report, args.timeline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""CPU 를 많이 사용하는 함수의 마이크로 벤치마크
+
+    python -m benchmarks.micro [--rounds 5] [--filter parse] [--output result.json]
+    python -m benchmarks.micro --compare baseline.json [--threshold 0.1]
+
+각 항목을 ``--rounds`` 번 반복 측정해서 호출 1회당 시간(us)의 최소, 중앙, 평균값을
+출력하고 ``--output`` 에 JSON 으로 저장합니다. ``--compare`` 로 이전 결과를 지정하면
+중앙값이 ``--threshold`` 비율 이상 느려진 항목이 있을 때 종료 코드 1 을 반환합니다.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import platform
+import statistics
+import subprocess
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from flaskfarmaider_bot.broadcast import BroadcastService, calc_similarity
+from flaskfarmaider_bot.models import AppSettings, LoggingConfig
+from flaskfarmaider_bot.helpers.parsers import filename_parse, get_parser
+from flaskfarmaider_bot.helpers.loggers import RedactingFilter
+from benchmarks.corpus import release_names, release_path
+from benchmarks.similarity import TITLES, make_candidate, mangle
+
+# settings.sample.yaml 의 규칙에서 생략된 경로만 채움
+MODULE_RULES = (
+    {"metadata": "ktv", "bot_downloader": "vod", "patterns": [r"-SW\.", r"-ST\."]},
+    {"metadata": "movie", "bot_downloader": "share_movie", "roots": ["/ROOT/GDRIVE/MOVIE"]},
+    {"metadata": "ftv", "bot_downloader": "vod", "roots": ["/ROOT/GDRIVE/FTV"]},
+    {"metadata": "ktv", "bot_downloader": "vod", "patterns": [".*"]},
+)
+TITLE_PATTERNS = (
+    r"^[\[\(].+[\]\)]\s(?P<title>.*?)(?:\s*[\(\[].*[\]\)])?$",
+    r"^.+?[-~](?P<title>.+?)[-~]",
+    r"^[^\w\s\(\[](?P<title>.+?)[^\w\s\)\]]",
+    r"^(?P<title>.+?)(?:\s*\(\d{4}\))?$",
+)
+ENCRYPT_KEY = "0123456789abcdef0123456789abcdef"
+CANDIDATE_COUNTS = (10, 50, 100, 500)
+
+# 준비 함수는 (측정할 함수, 함수 1회 실행당 호출 수)를 반환
+Benchmark = Callable[[random.Random], tuple[Callable[[], Any], int]]
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str) -> Callable[[Benchmark], Benchmark]:
+    def decorator(func: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = func
+        return func
+
+    return decorator
+
+
+def make_service() -> BroadcastService:
+    """네트워크와 캐시 없이 설정만 가진 서비스"""
+    service = BroadcastService.__new__(BroadcastService)
+    service.settings = AppSettings(
+        user_yaml_file=os.devnull,
+        discord={},
+        api={},
+        flaskfarm={},
+        broadcast={
+            "source": {},
+            "target": {},
+            "encrypt": {"key": ENCRYPT_KEY},
+            "module_rules": MODULE_RULES,
+            "title_patterns": TITLE_PATTERNS,
+            "genre_by_subfolders": ("/ROOT/GDRIVE/MOVIE",),
+        },
+    )
+    return service
+
+
+@benchmark("filename_parse")
+def bench_filename_parse(rnd: random.Random) -> tuple[Callable[[], Any], int]:
+    names = release_names(rnd, 500)
+    # LRU 캐시를 거치지 않는 분석 비용
+    parser = get_parser()
+
+    def run() -> None:
+        for name in names:
+            parser.parse(name, True, False)
+
+    return run, len(names)
+
+
+@benchmark("filename_parse[cached]")
+def bench_filename_parse_cached(rnd: random.Random) -> tuple[Callable[[], Any], int]:
+    names = release_names(rnd, 500)
+
+    def run() -> None:
+        for name in names:
+            filename_parse(name)
+
+    return run, len(names)
+
+
+@benchmark("calc_similarity")
+def bench_calc_similarity(rnd: random.Random) -> tuple[Callable[[], Any], int]:
+    pairs = []
+    for _ in range(2000):
+        ko, en, _ = rnd.choice(TITLES)
+        other = rnd.choice(TITLES)
+        pairs.append((mangle(rnd, rnd.choice((ko, en))), rnd.choice(other[:2])))
+
+    def run() -> None:
+        for target, candidate in pairs:
+            calc_similarity(target, candidate)
+
+    return run, len(pairs)
+
+
+def make_select_case(rnd: random.Random, count: int) -> dict[str, Any]:
+    # 작품 수보다 많은 후보는 시즌 번호를 붙여서 채움
+    pool = [
+        (f"{ko} {season}" if season > 1 else ko, f"{en} {season}" if season > 1 else en, year)
+        for season in range(1, count // len(TITLES) + 2)
+        for ko, en, year in TITLES
+    ]
+    entries = rnd.sample(pool, count)
+    ko, en, year = rnd.choice(entries)
+    return {
+        "results": [make_candidate(rnd, idx, entry) for idx, entry in enumerate(entries)],
+        "file_title": mangle(rnd, rnd.choice((ko, en))),
+        "path_title": mangle(rnd, ko) if rnd.random() < 0.6 else None,
+        "year": year,
+        "provider": rnd.choice((None, "wavve", "tving")),
+    }
+
+
+def make_select_benchmark(count: int) -> Benchmark:
+    def prepare(rnd: random.Random) -> tuple[Callable[[], Any], int]:
+        service = make_service()
+        cases = [make_select_case(rnd, count) for _ in range(max(2000 // count, 4))]
+
+        def run() -> None:
+            for case in cases:
+                service._select_best_result(**case)
+
+        return run, len(cases)
+
+    return prepare
+
+
+for _count in CANDIDATE_COUNTS:
+    benchmark(f"select_best_result[{_count}]")(make_select_benchmark(_count))
+
+
+@benchmark("module_rules")
+def bench_module_rules(rnd: random.Random) -> tuple[Callable[[], Any], int]:
+    service = make_service()
+    paths = [Path(release_path(rnd)) for _ in range(2000)]
+
+    def run() -> None:
+        for path in paths:
+            service._get_category_and_module(path)
+
+    return run, len(paths)
+
+
+@benchmark("get_search_keywords")
+def bench_get_search_keywords(rnd: random.Random) -> tuple[Callable[[], Any], int]:
+    config = make_service().settings.broadcast
+    titles = []
+    for _ in range(2000):
+        ko, en, year = rnd.choice(TITLES)
+        title = rnd.choice((ko, en))
+        titles.append(
+            rnd.choice(
+                (
+                    title,
+                    f"{title} ({year})",
+                    f"[{rnd.choice(('KBS2', 'tvN', 'JTBC'))}] {title}",
+                    f"{title}-{rnd.choice(('NEXT', 'SW'))}-",
+                )
+            )
+        )
+
+    def run() -> None:
+        for title in titles:
+            config.get_search_keywords(title)
+
+    return run, len(titles)
+
+
+def make_payloads(service: BroadcastService, rnd: random.Random) -> list[dict[str, Any]]:
+    payloads = []
+    for idx in range(500):
+        path = Path(release_path(rnd))
+        parsed = filename_parse(path.name)
+        data = service._build_vod_data(
+            metadata={"code": f"KD{idx:05d}", "title": parsed.get("title"), "genre": ["드라마"]},
+            path=path,
+            item=f"item-{idx}",
+            module="vod",
+            file_title=parsed.get("title") or path.stem,
+            file_count=1,
+            total_size=rnd.randint(10**8, 10**10),
+            parsed=parsed,
+        )
+        payloads.append(data)
+    return payloads
+
+
+@benchmark("encrypt")
+def bench_encrypt(rnd: random.Random) -> tuple[Callable[[], Any], int]:
+    service = make_service()
+    payloads = [json.dumps(data) for data in make_payloads(service, rnd)]
+
+    def run() -> None:
+        for payload in payloads:
+            service.encrypt(payload, ENCRYPT_KEY)
+
+    return run, len(payloads)
+
+
+@benchmark("encrypt_payloads[single]")
+def bench_encrypt_payloads_single(rnd: random.Random) -> tuple[Callable[[], Any], int]:
+    # 직렬화를 포함한 메시지 하나의 비용
+    service = make_service()
+    payloads = make_payloads(service, rnd)
+
+    def run() -> None:
+        for payload in payloads:
+            service.encrypt_payloads([payload])
+
+    return run, len(payloads)
+
+
+@benchmark("encrypt_payloads[batch]")
+def bench_encrypt_payloads_batch(rnd: random.Random) -> tuple[Callable[[], Any], int]:
+    service = make_service()
+    payloads = make_payloads(service, rnd)
+
+    def run() -> None:
+        service.encrypt_payloads(payloads)
+
+    return run, len(payloads)
+
+
+@benchmark("redact")
+def bench_redact(rnd: random.Random) -> tuple[Callable[[], Any], int]:
+    redactor = RedactingFilter(LoggingConfig().redacted_patterns)
+    lines = []
+    for idx in range(2000):
+        name = release_names(rnd, 1)[0]
+        lines.append(
+            rnd.choice(
+                (
+                    f"Broadcast Downloader: item=item-{idx} file_count=1 total_size=0 path='/ROOT/GDRIVE/{name}'",
+                    f"POST http://localhost:9999/metadata/api/ktv/search?call=plex&keyword={name}&apikey=abcd{idx}",
+                    f"Relay to https://discord.com/api/webhooks/{idx}123456/abcdefghijklmnop{idx}",
+                    f"{{'token': 'zzzz.{idx}.yyyy', 'channel': {idx}}}",
+                )
+            )
+        )
+
+    def run() -> None:
+        for line in lines:
+            redactor.redact(line)
+
+    return run, len(lines)
+
+
+def measure(func: Callable[[], Any], calls: int, rounds: int) -> dict[str, Any]:
+    func()  # 준비 실행 (import, 정규식 캐시 등)
+    per_call = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        per_call.append((time.perf_counter() - started) / calls * 1e6)
+    return {
+        "calls": calls,
+        "rounds": rounds,
+        "min_us": round(min(per_call), 3),
+        "median_us": round(statistics.median(per_call), 3),
+        "mean_us": round(statistics.fmean(per_call), 3),
+        "stdev_us": round(statistics.stdev(per_call), 3) if len(per_call) > 1 else 0.0,
+    }
+
+
+def get_revision() -> str:
+    try:
+        return subprocess.run(
+            ("git", "rev-parse", "--short", "HEAD"),
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def compare(
+    results: dict[str, dict], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    """기준보다 ``threshold`` 비율 이상 느려진 항목"""
+    regressions = []
+    for name, result in results.items():
+        if not (base := baseline.get(name)) or not base.get("median_us"):
+            print(f"  {name:<28} (no baseline)")
+            continue
+        ratio = result["median_us"] / base["median_us"]
+        mark = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            mark = "  REGRESSION"
+        print(f"  {name:<28} {base['median_us']:>10.2f} -> {result['median_us']:>10.2f} us ({ratio:.2f}x){mark}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--filter", default="", help="이름에 이 문자열이 포함된 항목만 실행")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--threshold", type=float, default=0.1, help="느려짐 허용 비율")
+    args = parser.parse_args()
+    # 디버그 로그 출력 비용은 측정하지 않음
+    logging.disable(logging.CRITICAL)
+
+    results = {}
+    for name, prepare in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        func, calls = prepare(random.Random(args.seed))
+        results[name] = measure(func, calls, args.rounds)
+        result = results[name]
+        print(
+            f"{name:<28} {result['median_us']:>10.2f} us/call "
+            f"(min {result['min_us']:.2f}, stdev {result['stdev_us']:.2f}, calls {calls})"
+        )
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": get_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"saved: {args.output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f).get("results") or {}
+        print(f"compare: {args.compare}")
+        if regressions := compare(results, baseline, args.threshold):
+            print(f"regressions: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""파일명 분석 동일성 벤치마크
+
+``filename_parse`` 가 이전 구현(호출마다 ``FilenameParser`` 를 새로 만들어 분석)과
+같은 결과를 반환하는지 생성한 한글 릴리즈 파일명으로 확인하고
+이전 구현, 미리 컴파일된 파서, LRU 캐시를 거친 호출의 1회당 시간을 비교합니다.
+
+    python -m benchmarks.parsers [--count 2000] [--rounds 3] [--seed 0]
+
+결과가 하나라도 다르면 AssertionError 가 발생합니다.
+"""
+
+import time
+import random
+import argparse
+
+from flaskfarmaider_bot.helpers.parsers import (
+    FilenameParser,
+    _cached_parse,
+    filename_parse,
+    get_parser,
+)
+from benchmarks.corpus import release_names
+
+OPTIONS = ((True, False), (False, False), (True, True), (False, True))
+
+
+def timed(func, names: list[str], rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for name in names:
+            func(name)
+    return (time.perf_counter() - started) / (len(names) * rounds) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    names = release_names(random.Random(args.seed), args.count)
+    for standardise, coherent_types in OPTIONS:
+        for name in names:
+            expected = FilenameParser().parse(name, standardise, coherent_types)
+            assert get_parser().parse(name, standardise, coherent_types) == expected, name
+            assert filename_parse(name, standardise, coherent_types) == expected, name
+
+    reference = timed(lambda name: FilenameParser().parse(name, True, False), names, args.rounds)
+    compiled = timed(lambda name: get_parser().parse(name, True, False), names, args.rounds)
+    _cached_parse.cache_clear()
+    cold = timed(filename_parse, names, 1)
+    cached = timed(filename_parse, names, args.rounds)
+
+    print(f"names: {len(names)}, rounds: {args.rounds}, cache: {_cached_parse.cache_info()}")
+    print("result: identical")
+    print(f"reference: {reference:.1f} us/call")
+    print(f"compiled:  {compiled:.1f} us/call ({reference / compiled:.2f}x)")
+    print(f"cold:      {cold:.1f} us/call (first call through the cache)")
+    print(f"cached:    {cached:.1f} us/call ({reference / cached:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""후보 점수 계산 동일성 벤치마크
+
+``BroadcastService._select_best_result`` 가 이전 구현(매번 정규화 후
+``difflib.SequenceMatcher.ratio`` 계산)과 같은 항목을 같은 점수로 선택하는지
+실제 한글/영문 작품 제목으로 확인하고 두 구현의 실행 시간을 비교합니다.
+
+    python -m benchmarks.similarity [--rounds 3] [--seed 0]
+
+선택한 항목이나 점수가 하나라도 다르면 AssertionError 가 발생합니다.
+"""
+
+import re
+import time
+import random
+import difflib
+import argparse
+
+from flaskfarmaider_bot.broadcast import BroadcastService
+
+RE_NORMALIZE = re.compile(r"[\s\W_]+")
+
+# (한글 제목, 영문 제목, 년도)
+TITLES = (
+    ("더 글로리", "The Glory", 2022),
+    ("오징어 게임", "Squid Game", 2021),
+    ("이상한 변호사 우영우", "Extraordinary Attorney Woo", 2022),
+    ("사랑의 불시착", "Crash Landing on You", 2019),
+    ("도깨비", "Guardian: The Lonely and Great God", 2016),
+    ("미스터 션샤인", "Mr. Sunshine", 2018),
+    ("나의 아저씨", "My Mister", 2018),
+    ("응답하라 1988", "Reply 1988", 2015),
+    ("응답하라 1994", "Reply 1994", 2013),
+    ("응답하라 1997", "Reply 1997", 2012),
+    ("슬기로운 의사생활", "Hospital Playlist", 2020),
+    ("슬기로운 감빵생활", "Prison Playbook", 2017),
+    ("이태원 클라쓰", "Itaewon Class", 2020),
+    ("킹덤", "Kingdom", 2019),
+    ("스위트홈", "Sweet Home", 2020),
+    ("지금 우리 학교는", "All of Us Are Dead", 2022),
+    ("무빙", "Moving", 2023),
+    ("눈물의 여왕", "Queen of Tears", 2024),
+    ("선재 업고 튀어", "Lovely Runner", 2024),
+    ("재벌집 막내아들", "Reborn Rich", 2022),
+    ("빈센조", "Vincenzo", 2021),
+    ("펜트하우스", "The Penthouse: War in Life", 2020),
+    ("펜트하우스 2", "The Penthouse 2: War in Life", 2021),
+    ("펜트하우스 3", "The Penthouse 3: War in Life", 2021),
+    ("비밀의 숲", "Stranger", 2017),
+    ("비밀의 숲 2", "Stranger 2", 2020),
+    ("나의 해방일지", "My Liberation Notes", 2022),
+    ("유미의 세포들", "Yumi's Cells", 2021),
+    ("유미의 세포들 2", "Yumi's Cells 2", 2022),
+    ("D.P.", "D.P.", 2021),
+    ("D.P. 2", "D.P. 2", 2023),
+    ("모범택시", "Taxi Driver", 2021),
+    ("모범택시 2", "Taxi Driver 2", 2023),
+    ("무한도전", "Infinite Challenge", 2005),
+    ("나 혼자 산다", "I Live Alone", 2013),
+    ("런닝맨", "Running Man", 2010),
+    ("놀면 뭐하니?", "Hangout with Yoo", 2019),
+    ("유 퀴즈 온 더 블럭", "You Quiz on the Block", 2018),
+    ("전지적 참견 시점", "The Manager", 2018),
+    ("나는 SOLO", "I Am Solo", 2021),
+    ("뉴스데스크", "MBC Newsdesk", 1970),
+    ("1박 2일 시즌4", "2 Days & 1 Night Season 4", 2019),
+    ("신서유기", "New Journey to the West", 2015),
+    ("기생충", "Parasite", 2019),
+    ("올드보이", "Oldboy", 2003),
+    ("부산행", "Train to Busan", 2016),
+    ("범죄도시", "The Outlaws", 2017),
+    ("범죄도시 2", "The Roundup", 2022),
+    ("범죄도시 3", "The Roundup: No Way Out", 2023),
+    ("범죄도시 4", "The Roundup: Punishment", 2024),
+    ("서울의 봄", "12.12: The Day", 2023),
+    ("파묘", "Exhuma", 2024),
+    ("헤어질 결심", "Decision to Leave", 2022),
+    ("극한직업", "Extreme Job", 2019),
+    ("명량", "The Admiral: Roaring Currents", 2014),
+    ("한산: 용의 출현", "Hansan: Rising Dragon", 2022),
+    ("노량: 죽음의 바다", "Noryang: Deadly Sea", 2023),
+    ("신과함께-죄와 벌", "Along with the Gods: The Two Worlds", 2017),
+    ("신과함께-인과 연", "Along with the Gods: The Last 49 Days", 2018),
+    ("아가씨", "The Handmaiden", 2016),
+    ("살인의 추억", "Memories of Murder", 2003),
+    ("괴물", "The Host", 2006),
+    ("마더", "Mother", 2009),
+    ("곡성", "The Wailing", 2016),
+    ("타짜", "Tazza: The High Rollers", 2006),
+    ("베테랑", "Veteran", 2015),
+    ("베테랑 2", "I, the Executioner", 2024),
+    ("인셉션", "Inception", 2010),
+    ("인터스텔라", "Interstellar", 2014),
+    ("다크 나이트", "The Dark Knight", 2008),
+    ("다크 나이트 라이즈", "The Dark Knight Rises", 2012),
+    ("오펜하이머", "Oppenheimer", 2023),
+    ("토이 스토리", "Toy Story", 1995),
+    ("토이 스토리 2", "Toy Story 2", 1999),
+    ("토이 스토리 3", "Toy Story 3", 2010),
+    ("토이 스토리 4", "Toy Story 4", 2019),
+    ("겨울왕국", "Frozen", 2013),
+    ("겨울왕국 2", "Frozen II", 2019),
+    ("인사이드 아웃", "Inside Out", 2015),
+    ("인사이드 아웃 2", "Inside Out 2", 2024),
+    ("어벤져스", "The Avengers", 2012),
+    ("어벤져스: 에이지 오브 울트론", "Avengers: Age of Ultron", 2015),
+    ("어벤져스: 인피니티 워", "Avengers: Infinity War", 2018),
+    ("어벤져스: 엔드게임", "Avengers: Endgame", 2019),
+    ("스파이더맨: 노 웨이 홈", "Spider-Man: No Way Home", 2021),
+    ("듄", "Dune", 2021),
+    ("듄: 파트 2", "Dune: Part Two", 2024),
+    ("탑건: 매버릭", "Top Gun: Maverick", 2022),
+    ("미션 임파서블: 데드 레코닝 PART ONE", "Mission: Impossible - Dead Reckoning Part One", 2023),
+    ("기묘한 이야기", "Stranger Things", 2016),
+    ("왕좌의 게임", "Game of Thrones", 2011),
+    ("하우스 오브 드래곤", "House of the Dragon", 2022),
+    ("브레이킹 배드", "Breaking Bad", 2008),
+    ("베터 콜 사울", "Better Call Saul", 2015),
+    ("더 라스트 오브 어스", "The Last of Us", 2023),
+    ("석세션", "Succession", 2018),
+    ("더 베어", "The Bear", 2022),
+    ("웬즈데이", "Wednesday", 2022),
+    ("종이의 집", "Money Heist", 2017),
+    ("종이의 집: 공동경제구역", "Money Heist: Korea - Joint Economic Area", 2022),
+    ("블랙 미러", "Black Mirror", 2011),
+    ("더 크라운", "The Crown", 2016),
+    ("프렌즈", "Friends", 1994),
+    ("오피스", "The Office", 2005),
+    ("빅뱅 이론", "The Big Bang Theory", 2007),
+    ("셜록", "Sherlock", 2010),
+    ("워킹 데드", "The Walking Dead", 2010),
+    ("만달로리안", "The Mandalorian", 2019),
+    ("쇼군", "Shogun", 2024),
+    ("진격의 거인", "Attack on Titan", 2013),
+    ("귀멸의 칼날", "Demon Slayer: Kimetsu no Yaiba", 2019),
+    ("주술회전", "Jujutsu Kaisen", 2020),
+    ("나 혼자만 레벨업", "Solo Leveling", 2024),
+    ("장송의 프리렌", "Frieren: Beyond Journey's End", 2023),
+    ("원피스", "One Piece", 1999),
+    ("스파이 패밀리", "Spy x Family", 2022),
+)
+
+SITES = ("daum", "tving", "wavve", "watcha", "tmdb")
+PROVIDERS = (None, None, "wavve", "tving")
+
+
+def reference_similarity(target: str | None, candidate: str | None) -> float:
+    """이전 구현의 ``calc_similarity``"""
+    if not target or not candidate:
+        return 0.0
+    norm_target = RE_NORMALIZE.sub("", str(target)).lower()
+    norm_cand = RE_NORMALIZE.sub("", str(candidate)).lower()
+    if not norm_target or not norm_cand:
+        return 0.0
+    if norm_target == norm_cand:
+        return 1.0
+    min_len = min(len(norm_target), len(norm_cand))
+    max_len = max(len(norm_target), len(norm_cand))
+    len_ratio = min_len / max_len
+    if (norm_target in norm_cand or norm_cand in norm_target) and len_ratio >= 0.5:
+        return 0.75 + 0.2 * len_ratio
+    return difflib.SequenceMatcher(None, norm_target, norm_cand).ratio()
+
+
+def reference_scores(
+    results: list[dict],
+    file_title: str | None = None,
+    path_title: str | None = None,
+    year: int = 1900,
+    provider: str | None = None,
+) -> list[tuple]:
+    """이전 구현의 ``_select_best_result`` 가 정렬한 (점수, -순서, 항목) 목록"""
+    scored_items = []
+    for idx, item in enumerate(results):
+        candidates = item.get("titles") or {item.get("title")}
+        p_score = (
+            max((reference_similarity(path_title, c) for c in candidates), default=0.0)
+            if path_title
+            else 0.0
+        )
+        f_score = (
+            max((reference_similarity(file_title, c) for c in candidates), default=0.0)
+            if file_title
+            else 0.0
+        )
+        item_score = max(p_score * 1.1, f_score)
+        try:
+            if year and int(year) > 1900 and item.get("year") == int(year):
+                item_score += 0.15
+        except (ValueError, TypeError):
+            pass
+        if provider and item.get("site") == provider:
+            item_score += 0.2
+        scored_items.append((item_score, -idx, item))
+    scored_items.sort(key=lambda x: (x[0], x[1]))
+    return scored_items
+
+
+def make_candidate(rnd: random.Random, idx: int, entry: tuple) -> dict:
+    ko, en, year = entry
+    return {
+        "code": f"K{rnd.choice('DVWX')}{idx:05d}",
+        "title": ko,
+        "titles": {ko, en},
+        "year": year if rnd.random() < 0.9 else None,
+        "site": rnd.choice(SITES),
+    }
+
+
+def mangle(rnd: random.Random, title: str) -> str:
+    """파일명에서 추출되는 제목처럼 변형"""
+    match rnd.randrange(5):
+        case 0:
+            return title.replace(" ", ".")
+        case 1:
+            return title.replace(" ", "")
+        case 2 if len(title) > 3:
+            pos = rnd.randrange(len(title))
+            return title[:pos] + title[pos + 1 :]
+        case 3:
+            return f"{title} {rnd.choice(('E01', 'Part 1', 'HDTV', '1080p'))}"
+        case _:
+            return title.upper()
+
+
+def make_cases(rnd: random.Random) -> list[dict]:
+    cases = []
+    for answer in TITLES:
+        for _ in range(4):
+            pool = rnd.sample(TITLES, rnd.randint(4, 20))
+            if answer not in pool:
+                pool.insert(rnd.randrange(len(pool) + 1), answer)
+            results = [make_candidate(rnd, idx, entry) for idx, entry in enumerate(pool)]
+            ko, en, year = answer
+            file_title = mangle(rnd, rnd.choice((ko, en)))
+            path_title = mangle(rnd, rnd.choice((ko, en))) if rnd.random() < 0.6 else None
+            cases.append(
+                {
+                    "results": results,
+                    "file_title": file_title,
+                    "path_title": path_title,
+                    "year": year if rnd.random() < 0.7 else 1900,
+                    "provider": rnd.choice(PROVIDERS),
+                }
+            )
+    return cases
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    cases = make_cases(random.Random(args.seed))
+    # 점수 계산은 인스턴스 상태를 사용하지 않음
+    service = BroadcastService.__new__(BroadcastService)
+
+    for case in cases:
+        expected = reference_scores(**case)
+        selected = service._select_best_result(**case)
+        assert selected is expected[-1][2], (case, selected, expected[-1])
+
+    reference_time = current_time = 0.0
+    for _ in range(args.rounds):
+        started = time.perf_counter()
+        for case in cases:
+            reference_scores(**case)
+        reference_time += time.perf_counter() - started
+        started = time.perf_counter()
+        for case in cases:
+            service._select_best_result(**case)
+        current_time += time.perf_counter() - started
+
+    count = len(cases) * args.rounds
+    print(f"cases: {len(cases)} (titles: {len(TITLES)}), rounds: {args.rounds}")
+    print("selection: identical")
+    print(f"reference: {reference_time / count * 1e6:.1f} us/case")
+    print(f"current:   {current_time / count * 1e6:.1f} us/case")
+    print(f"speedup:   {reference_time / current_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
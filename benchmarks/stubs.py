@@ -0,0 +1,302 @@
+"""벤치마크용 flaskfarm 메타데이터 API 스텁과 가짜 디스코드 채널
+
+``/metadata/api/{category}/search`` 와 ``/metadata/api/{category}/info`` 를
+흉내내는 aiohttp 서버이며 응답 지연, 오류 비율, 응답 크기를 프로필로 지정합니다.
+봇과 따로 실행해서 실제 설정의 ``flaskfarm.url`` 로 사용할 수도 있습니다.
+
+    python -m benchmarks.stubs [--profile normal] [--port 9999]
+"""
+
+import re
+import random
+import asyncio
+import argparse
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Sequence
+
+import discord
+from aiohttp import web
+
+from benchmarks.similarity import TITLES
+
+RE_NORMALIZE = re.compile(r"[\s\W_]+")
+CODE_PREFIXES = {"ktv": "KD", "ftv": "FT", "movie": "MD"}
+
+
+@dataclass(slots=True)
+class StubProfile:
+    """스텁 서버의 응답 특성
+
+    latency: 평균 응답 지연(초)
+    jitter: 지연 시간에 더해지는 무작위 편차의 최대값(초)
+    error_rate: 500 응답을 보낼 확률
+    results: 검색 응답에 포함할 후보 수
+    padding: 응답 항목마다 덧붙일 줄거리 길이(문자)
+    """
+
+    latency: float = 0.05
+    jitter: float = 0.05
+    error_rate: float = 0.0
+    results: int = 10
+    padding: int = 512
+
+
+PROFILES: dict[str, StubProfile] = {
+    "fast": StubProfile(latency=0.005, jitter=0.005, results=5, padding=0),
+    "normal": StubProfile(),
+    "slow": StubProfile(latency=0.3, jitter=0.2, error_rate=0.02),
+    "flaky": StubProfile(latency=0.1, jitter=0.1, error_rate=0.2),
+    "large": StubProfile(results=50, padding=16384),
+}
+
+
+def normalize(text: str) -> str:
+    return RE_NORMALIZE.sub("", text).lower()
+
+
+class FlaskfarmStub:
+    """flaskfarm 메타데이터 검색/조회 API 스텁
+
+    검색어와 제목이 겹치는 작품을 먼저 넣고 나머지 후보는 다른 작품으로 채웁니다.
+    """
+
+    def __init__(
+        self,
+        profile: StubProfile,
+        titles: Sequence[tuple[str, str, int]] = TITLES,
+        seed: int | None = None,
+    ) -> None:
+        self.profile = profile
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.catalog: dict[str, list[dict[str, Any]]] = {}
+        self.codes: dict[str, dict[str, Any]] = {}
+        for category, prefix in CODE_PREFIXES.items():
+            entries = []
+            for idx, (title, title_en, year) in enumerate(titles):
+                entry = {
+                    "code": f"{prefix}{idx:05d}",
+                    "title": title,
+                    "title_en": title_en,
+                    "year": year,
+                    "norm": (normalize(title), normalize(title_en)),
+                }
+                entries.append(entry)
+                self.codes[entry["code"]] = entry
+            self.catalog[category] = entries
+        self.requests: dict[str, int] = {"search": 0, "info": 0}
+        self.errors = 0
+        self.runner: web.AppRunner | None = None
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        for action in ("search", "info"):
+            app.router.add_route(
+                "*", f"/metadata/api/{{category}}/{action}", getattr(self, action)
+            )
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self.runner = web.AppRunner(self.app(), access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host=host, port=port)
+        await site.start()
+        bound_port = self.runner.addresses[0][1]
+        return f"http://{host}:{bound_port}"
+
+    async def stop(self) -> None:
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+    async def _respond(self, action: str) -> web.Response | None:
+        """지연 후 오류로 응답해야 하면 500 응답을 반환"""
+        self.requests[action] += 1
+        profile = self.profile
+        delay = profile.latency + self.random.uniform(0, profile.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if profile.error_rate and self.random.random() < profile.error_rate:
+            self.errors += 1
+            return web.json_response({"ret": "error"}, status=500)
+        return None
+
+    def _item(self, entry: dict[str, Any], score: int) -> dict[str, Any]:
+        item = {
+            "code": entry["code"],
+            "title": entry["title"],
+            "title_en": entry["title_en"],
+            "year": entry["year"],
+            "score": score,
+            "image_url": f"https://example.com/poster/{entry['code']}.jpg",
+        }
+        if self.profile.padding:
+            item["desc"] = "가" * self.profile.padding
+        return item
+
+    async def search(self, request: web.Request) -> web.Response:
+        if error := await self._respond("search"):
+            return error
+        category = request.match_info["category"]
+        entries = self.catalog.get(category) or []
+        keyword = normalize(request.query.get("keyword", ""))
+        matched = [
+            entry
+            for entry in entries
+            if keyword and any(keyword in norm or norm in keyword for norm in entry["norm"] if norm)
+        ]
+        others = [entry for entry in entries if entry not in matched]
+        # 요청 순서와 관계없이 같은 검색어에는 같은 후보를 반환
+        fillers = random.Random(f"{self.seed}:{category}:{keyword}").sample(
+            others, min(max(self.profile.results - len(matched), 0), len(others))
+        )
+        items = [
+            self._item(entry, 100 - idx)
+            for idx, entry in enumerate((*matched, *fillers)[: self.profile.results])
+        ]
+        if category == "movie":
+            return web.json_response(items)
+        # 방송 검색은 사이트별 목록
+        half = len(items) // 2
+        return web.json_response({"daum": items[:half], "wavve": items[half:]})
+
+    async def info(self, request: web.Request) -> web.Response:
+        if error := await self._respond("info"):
+            return error
+        if not (entry := self.codes.get(request.query.get("code", ""))):
+            return web.json_response({})
+        poster = f"https://example.com/poster/{entry['code']}.jpg"
+        return web.json_response(
+            {
+                "code": entry["code"],
+                "title": entry["title"],
+                "originaltitle": entry["title_en"],
+                "year": entry["year"],
+                "genre": ["드라마"],
+                "country": ["한국"],
+                "main_poster": poster,
+                "thumb": [{"aspect": "poster", "value": poster, "score": 100}],
+                "plot": "가" * self.profile.padding,
+            }
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {"requests": dict(self.requests), "errors": self.errors}
+
+
+class FakeChannel(discord.abc.Messageable):
+    """메시지를 보내지 않고 ``on_send`` 로 넘기는 디스코드 채널
+
+    ``ratelimit_rate`` 확률로 ``discord.RateLimited`` 를 발생시킵니다.
+    """
+
+    def __init__(
+        self,
+        channel_id: int,
+        latency: float = 0.0,
+        ratelimit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        on_send: Callable[[int, str], None] | None = None,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.id = channel_id
+        self.latency = latency
+        self.ratelimit_rate = ratelimit_rate
+        self.retry_after = retry_after
+        self.on_send = on_send
+        self.random = rng or random.Random()
+        self.sent = 0
+        self.ratelimited = 0
+
+    async def _get_channel(self) -> "FakeChannel":
+        return self
+
+    async def send(self, content: str | None = None, **kwds: Any) -> None:
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        if self.ratelimit_rate and self.random.random() < self.ratelimit_rate:
+            self.ratelimited += 1
+            raise discord.RateLimited(self.retry_after)
+        self.sent += 1
+        if self.on_send:
+            self.on_send(self.id, content or "")
+
+
+@dataclass
+class FakeDiscord:
+    """``SendScheduler`` 의 ``resolver`` 로 사용하는 가짜 채널 모음"""
+
+    channel_ids: Sequence[int]
+    latency: float = 0.0
+    ratelimit_rate: float = 0.0
+    retry_after: float = 1.0
+    on_send: Callable[[int, str], None] | None = None
+    seed: int | None = None
+    channels: dict[int, FakeChannel] = field(init=False, default_factory=dict)
+
+    def __post_init__(self) -> None:
+        rng = random.Random(self.seed)
+        for channel_id in self.channel_ids:
+            self.channels[channel_id] = FakeChannel(
+                channel_id,
+                latency=self.latency,
+                ratelimit_rate=self.ratelimit_rate,
+                retry_after=self.retry_after,
+                on_send=self.on_send,
+                rng=rng,
+            )
+
+    def get_channel(self, channel_id: int) -> FakeChannel | None:
+        return self.channels.get(channel_id)
+
+    def stats(self) -> dict[int, dict[str, int]]:
+        return {
+            channel_id: {"sent": channel.sent, "ratelimited": channel.ratelimited}
+            for channel_id, channel in self.channels.items()
+        }
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="normal")
+    parser.add_argument("--latency", type=float, help="평균 응답 지연(초)")
+    parser.add_argument("--jitter", type=float, help="응답 지연 편차(초)")
+    parser.add_argument("--error-rate", type=float, help="500 응답 확률")
+    parser.add_argument("--results", type=int, help="검색 후보 수")
+    parser.add_argument("--padding", type=int, help="항목별 줄거리 길이")
+
+
+def get_profile(args: argparse.Namespace) -> StubProfile:
+    overrides = {
+        name: value
+        for name in ("latency", "jitter", "error_rate", "results", "padding")
+        if (value := getattr(args, name)) is not None
+    }
+    return replace(PROFILES[args.profile], **overrides)
+
+
+async def serve(args: argparse.Namespace) -> None:
+    stub = FlaskfarmStub(get_profile(args), seed=args.seed)
+    url = await stub.start(args.host, args.port)
+    print(f"flaskfarm stub: {url} {stub.profile}")
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        await stub.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_profile_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9999)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,20 @@
 import sys
 import logging
 import asyncio
+import contextlib
+from collections import deque
 from typing import Any, Callable
 
 import discord
-import aiohttp
 from discord.ext import commands
 
 from .servers import FFaiderBotAPI
 from .models import AppSettings
 from .help import FlaskfarmaiderHelpCommand
 from .broadcast import BroadcastService
+from .clients import FlaskfarmClient
+from .queues import BroadcastJob, BroadcastQueue, BroadcastJournal, DeadLetterStore
+from .senders import SendScheduler
 from .cogs import AdminCog, GDSBroadcastCog, DownloaderBroadcastCog
 from .helpers.helpers import get_int
 
@@ -33,26 +37,70 @@ class FlaskfarmaiderBot(commands.Bot):
         for check in checks:
             self.add_check(check)
         self.help_command = FlaskfarmaiderHelpCommand(command_attrs={"checks": checks})
-        self.broadcast_queue: asyncio.Queue[tuple[str, dict]] = asyncio.Queue()
+        queue_settings = settings.broadcast.queue
+        journal = (
+            BroadcastJournal(queue_settings.journal, queue_settings.journal_batch)
+            if queue_settings.journal
+            else None
+        )
+        self.broadcast_queue = BroadcastQueue(queue_settings, journal)
+        # 처리 중인 경로별로 뒤이어 들어온 작업을 순서대로 보관
+        self._path_jobs: dict[tuple[str, str], deque[BroadcastJob]] = dict()
+        self._handler_limits: dict[str, asyncio.Semaphore] = {
+            handler: asyncio.Semaphore(max(limit, 1))
+            for handler, limit in settings.broadcast.queue.concurrency.items()
+        }
+        # 전송 단계로 넘어간 작업 수 제한
+        self._inflight = asyncio.Semaphore(max(queue_settings.max_inflight, 1))
+        # 전송 결과를 기다리는 태스크와 작업
+        self._inflight_tasks: dict[asyncio.Task, BroadcastJob] = {}
+        # 다운로더 방송은 메타데이터 조회(resolve)와 전송(send)을 나눠서 처리
+        # 조회가 끝난 작업은 대기열에서 꺼낸 순서대로 전송 단계로 넘김
+        self._pipeline: deque[tuple[BroadcastJob, asyncio.Future[list[str]]]] = deque()
+        self._pipeline_slots = asyncio.Semaphore(max(queue_settings.prefetch, 1))
+        self._pipeline_ready = asyncio.Event()
+        self._resolver_tasks: set[asyncio.Task] = set()
+        # 대기열에서 꺼냈지만 아직 전송 단계로 넘기지 못한 작업
+        self._claimed_jobs: set[BroadcastJob] = set()
+        self._drained = False
+        send_settings = settings.discord.send
+        self.send_scheduler = SendScheduler(
+            self.get_channel,
+            rate=send_settings.rate,
+            per=send_settings.per,
+            max_retries=send_settings.max_retries,
+            retry_delay=send_settings.retry_delay,
+            retry_max_delay=send_settings.retry_max_delay,
+            dead_letters=DeadLetterStore(send_settings.dead_letter),
+        )
         self.tasks: dict[str, asyncio.Task] = dict()
         self.api_server = None
-        self.session: aiohttp.ClientSession | None = None
+        self.flaskfarm_client = FlaskfarmClient(self.settings.flaskfarm)
         self.broadcast_service: BroadcastService | None = None
 
     async def setup_hook(self):
         """override"""
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-        self.broadcast_service = BroadcastService(self.session, self.settings)
-        if (
-            "broadcast_worker" not in self.tasks
-            or self.tasks["broadcast_worker"].done()
-        ):
-            task = asyncio.create_task(
-                self._broadcast_worker(), name="broadcast_worker"
+        self.broadcast_service = BroadcastService(self.flaskfarm_client, self.settings)
+        self.broadcast_queue.replay()
+        if self.settings.broadcast.queue.spill:
+            self.broadcast_queue.load_spill(self.settings.broadcast.queue.spill)
+        if self.broadcast_queue.journal and "broadcast_journal" not in self.tasks:
+            self.tasks["broadcast_journal"] = asyncio.create_task(
+                self.broadcast_queue.run_flusher(
+                    self.settings.broadcast.queue.journal_interval
+                ),
+                name="broadcast_journal",
             )
-            self.tasks["broadcast_worker"] = task
-            logger.debug("Broadcast worker task created.")
+        if "broadcast_pipeline" not in self.tasks:
+            self.tasks["broadcast_pipeline"] = asyncio.create_task(
+                self._pipeline_sender(), name="broadcast_pipeline"
+            )
+        for idx in range(max(self.settings.broadcast.queue.workers, 1)):
+            name = f"broadcast_worker_{idx}"
+            if name not in self.tasks or self.tasks[name].done():
+                task = asyncio.create_task(self._broadcast_worker(idx), name=name)
+                self.tasks[name] = task
+                logger.debug(f"Broadcast worker task created: {name}")
         await self.add_cog(GDSBroadcastCog(self))
         await self.add_cog(DownloaderBroadcastCog(self))
         await self.add_cog(AdminCog(self))
@@ -67,16 +115,77 @@ class FlaskfarmaiderBot(commands.Bot):
 
     async def close(self) -> None:
         """override"""
-        for task in self.tasks.values():
+        await self.drain()
+        tasks = self.tasks.values()
+        for task in tasks:
             if not task.done():
                 task.cancel()
-        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
-        if self.session:
-            await self.session.close()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.send_scheduler.close()
+        self.broadcast_queue.close()
+        if self.broadcast_service:
+            self.broadcast_service.close()
+        await self.flaskfarm_client.close()
         if self.api_server:
             await self.api_server.stop()
         await super().close()
 
+    async def drain(self) -> tuple[int, int]:
+        """새 작업을 받지 않고 남은 작업을 처리한 뒤 작업 태스크를 종료
+
+        ``drain_timeout`` 이 지나도 처리하지 못한 작업은 저널에 남기거나
+        ``spill`` 파일로 저장해서 다음 실행시 다시 처리합니다. 전송이 끝나지 않은
+        작업도 포함되며 일부 채널에는 이미 전송됐더라도 다시 처리됩니다.
+        """
+        if self._drained:
+            return 0, 0
+        self._drained = True
+        queue = self.broadcast_queue
+        queue_settings = self.settings.broadcast.queue
+        queue.accepting = False
+        before = queue.unfinished
+        if before and queue_settings.drain_timeout > 0:
+            logger.info(f"Draining {before} broadcast job(s)...")
+            try:
+                await asyncio.wait_for(queue.join(), queue_settings.drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Drain timed out after {queue_settings.drain_timeout}s: remaining={queue.unfinished}"
+                )
+        stage_tasks = [
+            task
+            for name, task in self.tasks.items()
+            if name.startswith(("broadcast_worker_", "broadcast_pipeline"))
+        ]
+        stage_tasks.extend(self._resolver_tasks)
+        for task in stage_tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*stage_tasks, return_exceptions=True)
+        # 전송 중인 작업은 완료 처리(ack)하지 않고 남은 작업에 포함
+        sending = list(self._inflight_tasks.items())
+        for task, _ in sending:
+            task.cancel()
+        await asyncio.gather(*(task for task, _ in sending), return_exceptions=True)
+        unsent = [job for task, job in sending if task.cancelled()]
+        remaining = sorted((*unsent, *self._claimed_jobs), key=lambda job: job.created)
+        remaining.extend(queue.take_pending())
+        self._claimed_jobs.clear()
+        spilled = 0
+        if remaining and queue.journal:
+            # 저널에 기록된 작업은 다음 실행시 다시 처리됨
+            spilled = len(remaining)
+        elif remaining and queue_settings.spill:
+            try:
+                spilled = queue.spill(queue_settings.spill, remaining)
+            except Exception:
+                logger.exception(f"Failed to spill broadcast jobs: {queue_settings.spill}")
+        drained = max(before - len(remaining), 0)
+        logger.info(
+            f"Broadcast queue drained: {drained=} {spilled=} dropped={len(remaining) - spilled}"
+        )
+        return drained, spilled
+
     async def on_message(self, message: discord.Message) -> None:
         """override"""
         if (
@@ -148,84 +257,238 @@ class FlaskfarmaiderBot(commands.Bot):
             await ctx.send_help(ctx.command)
 
     async def _send_to_channel(self, content: str, channel_id: int) -> bool:
-        target_ch = self.get_channel(channel_id)
-        if not target_ch:
-            logger.warning(f"Channel {channel_id} not found.")
-            return False
-        if not isinstance(target_ch, discord.abc.Messageable):
-            logger.warning(f"Channel {channel_id} is not messageable.")
-            return False
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                await target_ch.send(content)
-                return True
-            except discord.errors.DiscordServerError as e:
-                logger.error(
-                    f"Failed to send message to {channel_id} ({attempt + 1}/{max_retries}): {e}"
-                )
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(5)
-                else:
-                    logger.error(f"Maximum retry count exceeded for {channel_id}.")
-            except Exception:
-                logger.exception(
-                    f"An unexpected error occurred while sending to {channel_id}: {content=}"
-                )
-                return False
-        return False
+        return await self.send_scheduler.send(content, channel_id)
 
     async def _relay(self, content: str, channel_id: int) -> None:
         logger.debug(f"Relay to {channel_id}")
         await self._send_to_channel(content, channel_id)
 
-    async def _broadcast(self, content: str) -> None:
-        for channel_id in self.settings.broadcast.target.channels:
-            logger.debug(f"Broadcast to {channel_id}")
-            await self._send_to_channel(content, channel_id)
+    def _fan_out(self, content: str, key: Any = None) -> dict[int, asyncio.Future]:
+        channel_ids = tuple(self.settings.broadcast.target.channels)
+        logger.debug(f"Broadcast to {channel_ids}")
+        return {
+            channel_id: self.send_scheduler.submit(content, channel_id, key)
+            for channel_id in channel_ids
+        }
+
+    async def _gather_outcomes(self, futures: dict[int, asyncio.Future]) -> bool:
+        results = await asyncio.gather(*futures.values(), return_exceptions=True)
+        failed = []
+        for channel_id, result in zip(futures, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Broadcast to {channel_id} failed: {result!r}")
+            if result is not True:
+                failed.append(channel_id)
+        if failed:
+            logger.warning(
+                f"Broadcast failed for {len(failed)}/{len(futures)} channel(s): {failed}"
+            )
+        return not failed
+
+    async def _broadcast(self, content: str) -> bool:
+        return await self._gather_outcomes(self._fan_out(content))
+
+    async def build_content(
+        self,
+        handler: str,
+        path: str,
+        extra: str,
+        file_count: int = 0,
+        total_size: int = 0,
+    ) -> str:
+        match handler:
+            case "gds":
+                content = self.broadcast_service.get_gds_content(
+                    path, extra, file_count, total_size
+                )
+                logger.info(f"Broadcast GDS: mode={extra} {path=}")
+            case "downloader":
+                content = await self.broadcast_service.get_downloader_content(
+                    path, extra, file_count=file_count, total_size=total_size
+                )
+                logger.info(
+                    f"Broadcast Downloader: item={extra} {file_count=} {total_size=} {path=}"
+                )
+            case _:
+                raise ValueError(f"Unknown broadcast handler: {handler}")
+        return content
 
     async def broadcast_gds(
         self, path: str, mode: str, file_count: int = 0, total_size: int = 0
-    ) -> None:
-        content = self.broadcast_service.get_gds_content(path, mode, file_count, total_size)
-        logger.info(f"Broadcast GDS: {mode=} {path=}")
-        await self._broadcast(content)
+    ) -> bool:
+        content = await self.build_content("gds", path, mode, file_count, total_size)
+        return await self._broadcast(content)
 
     async def broadcast_downloader(
         self, path: str, item: str, file_count: int = 0, total_size: int = 0
+    ) -> bool:
+        content = await self.build_content(
+            "downloader", path, item, file_count, total_size
+        )
+        return await self._broadcast(content)
+
+    async def _complete_job(
+        self, job: BroadcastJob, futures: list[dict[int, asyncio.Future]]
     ) -> None:
-        content = await self.broadcast_service.get_downloader_content(
-            path, item, file_count=file_count, total_size=total_size
+        try:
+            for message_futures in futures:
+                await self._gather_outcomes(message_futures)
+            # 재시도에 실패한 전송은 dead letter 로 옮겨졌으므로 작업은 완료 처리
+            self.broadcast_queue.ack(job)
+        except asyncio.CancelledError:
+            # 종료 중 취소되면 남은 전송을 취소하고 작업은 다음 실행시 다시 처리
+            for message_futures in futures:
+                for future in message_futures.values():
+                    future.cancel()
+            raise
+        finally:
+            self._inflight.release()
+            self.broadcast_queue.task_done()
+
+    async def _dispatch(self, job: BroadcastJob, contents: list[str]) -> None:
+        """전송 단계로 넘기고 결과는 별도의 태스크에서 처리"""
+        await self._inflight.acquire()
+        self._claimed_jobs.discard(job)
+        task = asyncio.create_task(
+            # 같은 경로의 작업은 재시도가 있어도 채널별로 순서대로 전송
+            self._complete_job(
+                job, [self._fan_out(content, job.key) for content in contents]
+            ),
+            name=f"broadcast_job_{job.id or id(job)}",
         )
-        logger.info(
-            f"Broadcast Downloader: {item=} {file_count=} {total_size=} {path=}"
+        self._inflight_tasks[task] = job
+        task.add_done_callback(self._discard_inflight)
+
+    def _discard_inflight(self, task: asyncio.Task) -> None:
+        self._inflight_tasks.pop(task, None)
+
+    def _discard_job(self, job: BroadcastJob) -> None:
+        logger.exception(
+            f"Failed to broadcast: handler={job.handler} path={job.path} extra={job.extra}"
+        )
+        # 처리할 수 없는 작업이 재시작할 때마다 반복되지 않도록 완료 처리
+        self._claimed_jobs.discard(job)
+        self.broadcast_queue.ack(job)
+        self.broadcast_queue.task_done()
+
+    def _get_job_args(self, job: BroadcastJob) -> tuple[str, str, str, int, int]:
+        return (
+            job.handler,
+            job.path,
+            job.extra,
+            get_int(job.data.get("file_count"), default=1),
+            get_int(job.data.get("total_size"), default=0),
+        )
+
+    async def _build_job_contents(self, job: BroadcastJob) -> list[str]:
+        if items := job.data.get("items"):
+            contents = await self.broadcast_service.get_downloader_contents(items)
+            logger.info(f"Broadcast Downloader: items={len(items)} path={job.path}")
+            return contents
+        return [await self.build_content(*self._get_job_args(job))]
+
+    async def _process_job(self, job: BroadcastJob) -> None:
+        """작업의 콘텐츠를 만들고 전송 단계로 넘김
+
+        전송 결과는 기다리지 않으므로 재시도 중인 전송이 워커를 막지 않습니다.
+        """
+        if job.handler == "downloader":
+            await self._enqueue_pipeline(job)
+            return
+        limit = self._handler_limits.get(job.handler) or contextlib.nullcontext()
+        try:
+            async with limit:
+                contents = await self._build_job_contents(job)
+            await self._dispatch(job, contents)
+        except asyncio.CancelledError:
+            self.broadcast_queue.task_done()
+            raise
+        except Exception:
+            self._discard_job(job)
+
+    async def _enqueue_pipeline(self, job: BroadcastJob) -> None:
+        """조회 단계에 작업을 넣음 (버퍼가 가득 차면 대기)"""
+        try:
+            await self._pipeline_slots.acquire()
+        except asyncio.CancelledError:
+            self.broadcast_queue.task_done()
+            raise
+        future: asyncio.Future[list[str]] = asyncio.get_running_loop().create_future()
+        self._pipeline.append((job, future))
+        self._pipeline_ready.set()
+        task = asyncio.create_task(
+            self._resolve(job, future), name=f"broadcast_resolver_{id(job)}"
         )
-        await self._broadcast(content)
+        self._resolver_tasks.add(task)
+        task.add_done_callback(self._resolver_tasks.discard)
+
+    async def _resolve(
+        self, job: BroadcastJob, future: asyncio.Future[list[str]]
+    ) -> None:
+        limit = self._handler_limits.get(job.handler) or contextlib.nullcontext()
+        try:
+            async with limit:
+                contents = await self._build_job_contents(job)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(contents)
+
+    async def _pipeline_sender(self) -> None:
+        """조회가 끝난 작업을 들어온 순서대로 전송 단계로 넘김"""
+        while True:
+            while not self._pipeline:
+                self._pipeline_ready.clear()
+                await self._pipeline_ready.wait()
+            job, future = self._pipeline[0]
+            try:
+                await asyncio.wait((future,))
+            finally:
+                if future.done():
+                    self._pipeline.popleft()
+                    self._pipeline_slots.release()
+            if future.cancelled():
+                self.broadcast_queue.task_done()
+                continue
+            try:
+                contents = future.result()
+            except Exception:
+                self._discard_job(job)
+                continue
+            try:
+                await self._dispatch(job, contents)
+            except asyncio.CancelledError:
+                self.broadcast_queue.task_done()
+                raise
 
-    async def _broadcast_worker(self) -> None:
-        logger.debug("Broadcast worker started.")
-        handlers = {"gds": self.broadcast_gds, "downloader": self.broadcast_downloader}
+    async def _broadcast_worker(self, worker_id: int = 0) -> None:
+        logger.debug(f"Broadcast worker started: {worker_id}")
         try:
             while not self.is_closed():
                 try:
-                    handler, data = await self.broadcast_queue.get()
-                    path = data.get("path")
-                    extra = data.get("mode") or data.get("item")
-                    file_count = get_int(data.get("file_count"), default=1)
-                    total_size = get_int(data.get("total_size"), default=0)
+                    job = await self.broadcast_queue.get()
+                    self._claimed_jobs.add(job)
+                    if (pending := self._path_jobs.get(job.key)) is not None:
+                        # 같은 경로의 작업은 먼저 들어온 작업을 처리 중인 워커가 이어서 처리
+                        pending.append(job)
+                        continue
+                    pending = self._path_jobs[job.key] = deque()
                     try:
-                        await handlers[handler](path, extra, file_count, total_size)
-                    except Exception:
-                        logger.exception(
-                            f"Failed to broadcast: {handler=} {path=} {extra=}"
-                        )
+                        await self._process_job(job)
+                        while pending:
+                            await self._process_job(pending.popleft())
                     finally:
-                        self.broadcast_queue.task_done()
+                        self._path_jobs.pop(job.key, None)
                 except asyncio.CancelledError:
-                    logger.debug("Broadcast worker is being cancelled...")
+                    logger.debug(f"Broadcast worker is being cancelled: {worker_id}")
                     raise
                 except Exception as e:
                     logger.exception(e)
                     await asyncio.sleep(1)
         finally:
-            logger.debug("Broadcast worker stopped.")
+            logger.debug(f"Broadcast worker stopped: {worker_id}")
@@ -2,19 +2,31 @@ import os
 import re
 import json
 import base64
+import asyncio
 import difflib
 import logging
+import functools
+import multiprocessing
 from pathlib import Path
-from typing import Any
-from urllib.parse import urljoin, urlencode
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterable, Sequence
 
-import aiohttp
-from Crypto import Random
 from Crypto.Cipher import AES
 
 from .models import AppSettings
-from .helpers.parsers import filename_parse
-from .helpers.helpers import apply_cache, get_ttl_hash
+from .helpers.parsers import filename_parse, parse_filenames
+from .helpers import crypto
+from .helpers.helpers import apply_cache, get_int
+from .helpers.caches import (
+    MISSING,
+    LRUCache,
+    PersistentCache,
+    apply_persistent_cache,
+    make_cache_key,
+)
+from .indexes import TitleIndex
+from .clients import CircuitOpenError, FlaskfarmClient
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +35,10 @@ RE_YEAR = re.compile(r"\b(19\d\d|20\d\d)\b")
 RE_BRACKET_TAG = re.compile(r"\[.*?\]")
 RE_FOLDER_YEAR = re.compile(r"\((19\d\d|20\d\d)\)")
 RE_DATE_6DIGIT = re.compile(r"\d{6}")
+RE_DIGITS = re.compile(r"\d+")
+
+# 폴더명과 작품 제목이 이 점수 이상 비슷해야 폴더 단위로 작품 코드를 재사용
+SERIES_FOLDER_MIN_SCORE = 0.6
 
 TITLE_KEYS = (
     "title",
@@ -35,35 +51,313 @@ TITLE_KEYS = (
 )
 
 
+@functools.lru_cache(maxsize=4096)
+def normalize_title(value: str) -> str:
+    """유사도 비교를 위해 공백, 기호를 제거하고 소문자로 변환"""
+    return RE_NORMALIZE.sub("", value).lower()
+
+
+def _containment_score(norm_target: str, norm_cand: str) -> float | None:
+    """같거나 한쪽이 다른 쪽을 포함하는 경우의 점수 (해당하지 않으면 None)"""
+    if norm_target == norm_cand:
+        return 1.0
+    min_len = min(len(norm_target), len(norm_cand))
+    max_len = max(len(norm_target), len(norm_cand))
+    len_ratio = min_len / max_len
+    if (norm_target in norm_cand or norm_cand in norm_target) and len_ratio >= 0.5:
+        return 0.75 + 0.2 * len_ratio
+    return None
+
+
+def similarity_bound(norm_target: str, norm_cand: str) -> float:
+    """``normalized_similarity`` 결과의 상한 (길이만으로 계산)"""
+    if not norm_target or not norm_cand:
+        return 0.0
+    if (score := _containment_score(norm_target, norm_cand)) is not None:
+        return score
+    return 2.0 * min(len(norm_target), len(norm_cand)) / (len(norm_target) + len(norm_cand))
+
+
+def normalized_similarity(norm_target: str, norm_cand: str, floor: float = -1.0) -> float:
+    """정규화된 두 문자열의 유사도 점수(0.0 ~ 1.0)
+
+    결과가 ``floor`` 이하인 것이 확실하면 ``SequenceMatcher.ratio`` 를 계산하지 않고 0.0을 반환합니다.
+    """
+    if not norm_target or not norm_cand:
+        return 0.0
+    if (score := _containment_score(norm_target, norm_cand)) is not None:
+        return score
+    matcher = difflib.SequenceMatcher(None, norm_target, norm_cand)
+    if matcher.real_quick_ratio() <= floor or matcher.quick_ratio() <= floor:
+        return 0.0
+    return matcher.ratio()
+
+
 def calc_similarity(target: str | None, candidate: str | None) -> float:
     """두 문자열 간의 정규화 유사도 점수(0.0 ~ 1.0)를 계산합니다."""
     if not target or not candidate:
         return 0.0
-    norm_target = RE_NORMALIZE.sub("", str(target)).lower()
-    norm_cand = RE_NORMALIZE.sub("", str(candidate)).lower()
+    return normalized_similarity(
+        normalize_title(str(target)), normalize_title(str(candidate))
+    )
+
+
+def strict_similarity(norm_target: str, norm_cand: str) -> float:
+    """포함 관계 가산점 없이 계산한 유사도 (시즌, 속편 번호 등 숫자가 다르면 0.0)"""
     if not norm_target or not norm_cand:
         return 0.0
     if norm_target == norm_cand:
         return 1.0
+    if RE_DIGITS.findall(norm_target) != RE_DIGITS.findall(norm_cand):
+        return 0.0
+    return difflib.SequenceMatcher(None, norm_target, norm_cand).ratio()
 
-    min_len = min(len(norm_target), len(norm_cand))
-    max_len = max(len(norm_target), len(norm_cand))
-    len_ratio = min_len / max_len
 
-    if (norm_target in norm_cand or norm_cand in norm_target) and len_ratio >= 0.5:
-        return 0.75 + 0.2 * len_ratio
+def best_similarity(norm_target: str, norm_cands: Iterable[str]) -> float:
+    """후보 중 가장 높은 유사도 점수"""
+    best = 0.0
+    for norm_cand in norm_cands:
+        best = max(best, normalized_similarity(norm_target, norm_cand, best))
+        if best >= 1.0:
+            break
+    return best
+
+
+def total_score(
+    p_score: float, f_score: float, year_matched: bool, provider_score: float
+) -> float:
+    item_score = max(p_score * 1.1, f_score)
+    if year_matched:
+        item_score += 0.15
+    if provider_score:
+        item_score += provider_score
+    return item_score
+
+
+def compact_candidate(item: dict) -> tuple[tuple[str, ...], Any, Any]:
+    """점수 계산에 필요한 (제목 목록, 년도, 사이트)"""
+    titles = tuple(str(c) for c in (item.get("titles") or {item.get("title")}) if c)
+    return titles, item.get("year"), item.get("site")
 
-    return difflib.SequenceMatcher(None, norm_target, norm_cand).ratio()
+
+def score_candidates(
+    candidates: Sequence[tuple[Sequence[str], Any, Any]],
+    file_title: str | None = None,
+    path_title: str | None = None,
+    year: Any = 1900,
+    provider: str | None = None,
+) -> list[tuple[float, int, float, float, float]]:
+    """``compact_candidate`` 후보들의 점수를 오름차순으로 반환
+
+    항목은 (점수, -순서, 경로 점수, 파일 점수, 제공자 점수)이며 마지막 항목이 가장 적합한 후보입니다.
+    값만 주고받으므로 프로세스 풀에서 실행할 수 있습니다.
+    """
+    norm_path = normalize_title(str(path_title)) if path_title else ""
+    norm_file = normalize_title(str(file_title)) if file_title else ""
+    try:
+        target_year = int(year) if year and int(year) > 1900 else None
+    except (ValueError, TypeError):
+        target_year = None
+
+    # 점수 상한이 높은 항목부터 계산하고 가장 높은 점수를 넘을 수 없는 항목은 계산하지 않음
+    bounded_items = []
+    for idx, (titles, cand_year, site) in enumerate(candidates):
+        norm_cands = [normalize_title(title) for title in titles]
+        year_matched = target_year is not None and cand_year == target_year
+        provider_score = 0.2 if provider and site == provider else 0.0
+        p_bound = max((similarity_bound(norm_path, c) for c in norm_cands), default=0.0)
+        f_bound = max((similarity_bound(norm_file, c) for c in norm_cands), default=0.0)
+        bound = total_score(p_bound, f_bound, year_matched, provider_score)
+        bounded_items.append((bound, -idx, norm_cands, year_matched, provider_score))
+    bounded_items.sort(key=lambda x: (x[0], x[1]), reverse=True)
+
+    scored_items = []
+    best_key = (float("-inf"), 0)
+    for bound, neg_idx, norm_cands, year_matched, provider_score in bounded_items:
+        if (bound, neg_idx) <= best_key:
+            break
+        p_score = best_similarity(norm_path, norm_cands) if norm_path else 0.0
+        f_score = best_similarity(norm_file, norm_cands) if norm_file else 0.0
+        item_score = total_score(p_score, f_score, year_matched, provider_score)
+        best_key = max(best_key, (item_score, neg_idx))
+        scored_items.append((item_score, neg_idx, p_score, f_score, provider_score))
+
+    scored_items.sort(key=lambda x: (x[0], x[1]))
+    return scored_items
+
+
+def get_code_category(code: str) -> str:
+    """메타데이터 코드의 카테고리"""
+    match code[:1]:
+        case "M":
+            return "movie"
+        case "F":
+            return "ftv"
+        case _:
+            return "ktv"
+
+
+class MetadataSearchError(Exception):
+    """메타데이터 서버 요청이 실패해서 결과를 확정할 수 없음 (빈 결과로 캐시하지 않음)"""
 
 
 class BroadcastService:
     """방송 콘텐츠 생성 서비스 (메타데이터 조회 + 암호화)"""
 
-    def __init__(
-        self, session: aiohttp.ClientSession, settings: AppSettings
-    ) -> None:
-        self.session = session
+    def __init__(self, client: FlaskfarmClient, settings: AppSettings) -> None:
+        self.client = client
         self.settings = settings
+        self._search_limiter = asyncio.Semaphore(
+            max(settings.broadcast.search_concurrency, 1)
+        )
+        self._resolve_limiter = asyncio.Semaphore(
+            max(settings.broadcast.resolve_concurrency, 1)
+        )
+        self._process_pool: ProcessPoolExecutor | None = None
+        self.title_index: TitleIndex | None = None
+        index_settings = settings.broadcast.title_index
+        if index_settings.enabled:
+            try:
+                self.title_index = TitleIndex(
+                    index_settings.path, normalizer=normalize_title
+                )
+                for catalog in index_settings.catalogs:
+                    self.load_title_catalog(catalog)
+            except Exception:
+                logger.exception("Failed to load the title index")
+        self.persistent_cache: PersistentCache | None = None
+        cache_settings = settings.broadcast.metadata_cache
+        for method in (
+            self._query_metadata,
+            self._search_metadata,
+            self._lookup_metadata,
+        ):
+            method.cache.configure(
+                maxsize=cache_settings.memory_entries,
+                max_bytes=cache_settings.memory_bytes,
+                ttl=cache_settings.memory_ttl,
+            )
+        for method in (self._query_metadata, self._search_metadata):
+            method.cache.configure(negative_ttl=cache_settings.negative_ttl)
+        # 같은 폴더의 에피소드가 같은 작품 코드를 사용하도록 저장
+        self._series_codes = LRUCache(
+            cache_settings.series_entries, ttl=cache_settings.series_ttl
+        )
+        if cache_settings.path:
+            try:
+                self.persistent_cache = PersistentCache(
+                    cache_settings.path,
+                    ttl=cache_settings.ttl,
+                    max_entries=cache_settings.max_entries,
+                    warm_entries=cache_settings.warm_entries,
+                )
+            except Exception:
+                logger.exception(
+                    f"Failed to open metadata cache: {cache_settings.path}"
+                )
+
+    def load_title_catalog(self, source: str | Path | Iterable[dict]) -> int:
+        """내보낸 목록으로 제목 색인을 채우고 추가한 개수를 반환
+
+        ``source`` 는 항목 목록이거나 JSON 배열 혹은 JSON Lines 파일 경로입니다.
+        항목은 메타데이터 검색 결과와 같은 형식이며 ``category`` 가 없으면 코드로 판단합니다.
+        """
+        if self.title_index is None:
+            return 0
+        if isinstance(source, (str, Path)):
+            text = Path(source).read_text(encoding="utf-8")
+            try:
+                items = json.loads(text)
+            except json.JSONDecodeError:
+                items = [json.loads(line) for line in text.splitlines() if line.strip()]
+        else:
+            items = source
+        if isinstance(items, dict):
+            items = items.get("items") or []
+        candidates = []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            if cand := self._normalize_candidate(item):
+                candidates.append(
+                    (cand, item.get("category") or get_code_category(cand["code"]))
+                )
+        count = self.title_index.add_many(candidates)
+        logger.info(f"Loaded {count} title(s) into the title index.")
+        return count
+
+    def cache_stats(self) -> dict[str, Any]:
+        stats = {
+            "query": self._query_metadata.cache.stats(),
+            "search": self._search_metadata.cache.stats(),
+            "lookup": self._lookup_metadata.cache.stats(),
+            "series": self._series_codes.stats(),
+        }
+        if self.persistent_cache:
+            stats["persistent"] = self.persistent_cache.stats()
+        if self.title_index is not None:
+            stats["title_index"] = self.title_index.stats()
+        stats["flaskfarm"] = self.client.stats()
+        return stats
+
+    def clear_metadata_cache(self, negative_only: bool = True) -> int:
+        """메타데이터 캐시를 삭제하고 삭제한 항목 수를 반환
+
+        ``negative_only`` 이면 검색 결과가 없었던 항목만 삭제합니다.
+        """
+        count = 0 if negative_only else self._series_codes.clear()
+        for method in (
+            self._query_metadata,
+            self._search_metadata,
+            self._lookup_metadata,
+        ):
+            if negative_only:
+                count += method.cache.clear_negative()
+            else:
+                count += method.cache.clear()
+        if not negative_only and self.persistent_cache:
+            count += self.persistent_cache.clear()
+        logger.info(f"Metadata cache cleared: {count=} {negative_only=}")
+        return count
+
+    def get_process_pool(self) -> ProcessPoolExecutor | None:
+        """``process_pool.workers`` 가 설정된 경우 처음 사용할 때 프로세스 풀을 생성"""
+        workers = self.settings.broadcast.process_pool.workers
+        if workers <= 0:
+            return None
+        if self._process_pool is None:
+            # 스레드와 이벤트 루프를 가진 프로세스를 fork 하지 않도록 spawn 사용
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Process pool started: {workers=}")
+        return self._process_pool
+
+    def shutdown_process_pool(self) -> None:
+        if self._process_pool:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+
+    async def _run_cpu_bound(self, offload: bool, func: Callable, *args: Any) -> Any:
+        """``offload`` 이고 프로세스 풀이 있으면 풀에서 실행하고 아니면 바로 실행
+
+        ``func`` 와 인자, 결과는 pickle 할 수 있어야 합니다.
+        """
+        if offload and (pool := self.get_process_pool()):
+            try:
+                return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+            except BrokenProcessPool:
+                logger.exception("Process pool is broken, running in the event loop")
+                self.shutdown_process_pool()
+        return func(*args)
+
+    def close(self) -> None:
+        self.shutdown_process_pool()
+        if self.persistent_cache:
+            self.persistent_cache.close()
+            self.persistent_cache = None
+        if self.title_index is not None:
+            self.title_index.close()
 
     def get_gds_content(
         self, path: str, mode: str, file_count: int = 0, total_size: int = 0
@@ -79,18 +373,113 @@ class BroadcastService:
                 "size": total_size,
             },
         }
-        encrypted_data = self.encrypt(
-            json.dumps(data), self.settings.broadcast.encrypt.key
-        )
-        return f"```^{encrypted_data}```"
+        return self.encrypt_payloads([data])[0]
 
     async def get_downloader_content(
         self, path: str, item: str, file_count: int = 0, total_size: int = 0
     ) -> str:
         logger.debug(f"{path=} {item=} {file_count=} {total_size=}")
+        target = self._parse_downloader_path(path)
+        metadata = await self._fetch_target_metadata(target)
+        data = self._build_downloader_data(target, metadata, item, file_count, total_size)
+        return self.encrypt_payloads([data])[0]
+
+    async def get_downloader_contents(self, items: Sequence[dict]) -> list[str]:
+        """여러 항목의 콘텐츠를 같은 순서로 생성
+
+        같은 폴더의 항목은 첫 항목으로 메타데이터를 조회하고 폴더명이 조회된 작품의
+        제목과 일치하면 모든 항목에 사용합니다. 영화이거나 폴더명이 작품 제목이 아니면
+        (장르 폴더 등) 파일 제목과 년도가 같은 항목끼리 따로 조회합니다.
+        항목은 ``path``, ``item``, ``file_count``, ``total_size`` 값을 가집니다.
+        """
+        targets = await self._parse_downloader_paths([str(it["path"]) for it in items])
+        groups: dict[tuple[str, str], list[int]] = {}
+        for idx, target in enumerate(targets):
+            key = (self.get_group_path(target["path"]), target["category"])
+            groups.setdefault(key, []).append(idx)
+        contents: list[str] = [""] * len(items)
+
+        async def resolve(folder: str, category: str, indexes: list[int]) -> None:
+            first = targets[indexes[0]]
+            async with self._resolve_limiter:
+                logger.debug(f"Resolve group: {folder=} {category=} items={len(indexes)}")
+                resolved: dict[int, dict] = {}
+                # 영화는 폴더를 작품으로 보지 않으므로 바로 파일 제목별로 조회
+                if category != "movie":
+                    metadata = await self._fetch_target_metadata(
+                        first, is_series=any(targets[idx]["is_series"] for idx in indexes)
+                    )
+                    if self._is_folder_title(first["path_title"], metadata):
+                        resolved = dict.fromkeys(indexes, metadata)
+                if not resolved:
+                    subgroups: dict[tuple[str, Any], list[int]] = {}
+                    for idx in indexes:
+                        target = targets[idx]
+                        subgroups.setdefault((target["file_title"], target["year"]), []).append(idx)
+                    logger.debug(f"Resolve by file title: {folder=} titles={len(subgroups)}")
+                    results = await asyncio.gather(
+                        *(
+                            self._fetch_target_metadata(targets[sub_indexes[0]])
+                            for sub_indexes in subgroups.values()
+                        )
+                    )
+                    for sub_indexes, sub_metadata in zip(subgroups.values(), results):
+                        for idx in sub_indexes:
+                            resolved[idx] = sub_metadata
+            payloads = [
+                self._build_downloader_data(
+                    targets[idx],
+                    resolved[idx],
+                    str(items[idx]["item"]),
+                    get_int(items[idx].get("file_count"), 1),
+                    get_int(items[idx].get("total_size"), 0),
+                )
+                for idx in indexes
+            ]
+            # 그룹의 페이로드는 한 번에 암호화
+            for idx, content in zip(indexes, self.encrypt_payloads(payloads)):
+                contents[idx] = content
+
+        # 작품(그룹)별 조회는 동시에 진행하고 하나라도 실패하면 나머지는 취소
+        tasks = [
+            asyncio.create_task(resolve(folder, category, indexes))
+            for (folder, category), indexes in groups.items()
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return contents
+
+    def get_group_path(self, path: str | Path) -> str:
+        """같은 작품으로 묶을 폴더 (제목을 추출하는 폴더, 없으면 상위 폴더)"""
+        full_path = Path(path)
+        folder, _, _ = self._find_title_folder(full_path)
+        return str(folder or full_path.parent)
+
+    async def _parse_downloader_paths(self, paths: Sequence[str]) -> list[dict[str, Any]]:
+        """``_parse_downloader_path`` 와 같으며 파일명 분석은 프로세스 풀에 나눠서 실행"""
+        names = list(dict.fromkeys(Path(path).name for path in paths))
+        chunk_size = max(self.settings.broadcast.process_pool.chunk_size, 1)
+        chunks = [names[i : i + chunk_size] for i in range(0, len(names), chunk_size)]
+        results = await asyncio.gather(
+            *(self._run_cpu_bound(len(names) > 1, parse_filenames, chunk) for chunk in chunks)
+        )
+        parsed = {
+            name: parts
+            for chunk, chunk_result in zip(chunks, results)
+            for name, parts in zip(chunk, chunk_result)
+        }
+        return [self._parse_downloader_path(path, parsed[Path(path).name]) for path in paths]
+
+    def _parse_downloader_path(
+        self, path: str, parsed: dict | None = None
+    ) -> dict[str, Any]:
         full_path = Path(path)
         category, module = self._get_category_and_module(full_path)
-        parsed_parts = filename_parse(full_path.name)
+        parsed_parts = parsed if parsed is not None else filename_parse(full_path.name)
         file_title = parsed_parts.get("title") or full_path.stem
         path_title, path_year = self._extract_path_title(full_path)
         year = path_year or parsed_parts.get("year") or 1900
@@ -101,34 +490,48 @@ class BroadcastService:
             or (parsed_parts.get("month") and parsed_parts.get("day"))
         )
         logger.debug(f"{parsed_parts=} {file_title=} {path_title=} {year=} {is_series=}")
-        metadata = await self._fetch_metadata(
-            full_path,
-            category,
-            file_title=file_title,
-            path_title=path_title,
-            year=year,
-            is_series=is_series,
-        )
-        if category == "movie":
+        return {
+            "path": full_path,
+            "category": category,
+            "module": module,
+            "parsed": parsed_parts,
+            "file_title": file_title,
+            "path_title": path_title,
+            "year": year,
+            "is_series": is_series,
+        }
+
+    def _build_downloader_data(
+        self,
+        target: dict[str, Any],
+        metadata: dict,
+        item: str,
+        file_count: int = 0,
+        total_size: int = 0,
+    ) -> dict[str, Any]:
+        if target["category"] == "movie":
             builder = self._build_movie_data
         else:
             builder = self._build_vod_data
-        data = builder(
+        return builder(
             metadata=metadata,
-            path=full_path,
+            path=target["path"],
             item=item,
-            module=module,
-            file_title=file_title,
+            module=target["module"],
+            file_title=target["file_title"],
             file_count=file_count,
             total_size=total_size,
-            parsed=parsed_parts,
+            parsed=target["parsed"],
         )
-        encrypted_data = self.encrypt(
-            json.dumps(data), self.settings.broadcast.encrypt.key
-        )
-        return f"```^{encrypted_data}```"
 
     def _extract_path_title(self, full_path: Path) -> tuple[str | None, int | None]:
+        _, title, year = self._find_title_folder(full_path)
+        return title, year
+
+    def _find_title_folder(
+        self, full_path: Path
+    ) -> tuple[Path | None, str | None, int | None]:
+        """제목으로 사용할 상위 폴더와 폴더명에서 추출한 제목, 년도"""
         for parent in full_path.parents[:2]:
             folder_name = parent.name
             if not folder_name or self.settings.broadcast.is_match_ignore_title(folder_name):
@@ -143,8 +546,8 @@ class BroadcastService:
             if not cleaned:
                 continue
 
-            return cleaned, year
-        return None, None
+            return parent, cleaned, year
+        return None, None, None
 
     def _get_category_and_module(self, full_path: Path) -> tuple[str, str]:
         for mod_rule in self.settings.broadcast.module_rules:
@@ -207,36 +610,183 @@ class BroadcastService:
         return candidates
 
     async def _search_candidates(
-        self, title: str, category: str, year: int
-    ) -> list[dict]:
-        keywords = list(dict.fromkeys(self.settings.broadcast.get_search_keywords(title)))
-        for kw in keywords:
-            if res := await self._search_metadata(kw, category, year):
-                if candidates := self._extract_candidates(res):
-                    return candidates
+        self, keyword: str, category: str, year: int
+    ) -> list[dict] | None:
+        """검색 결과의 후보 목록 (검색에 실패하면 None)"""
+        try:
+            if res := await self._search_metadata(keyword, category, year):
+                return self._extract_candidates(res)
+        except MetadataSearchError:
+            return None
+        except Exception:
+            logger.exception(f"Candidate searching failed: {keyword=} {category=}")
+            return None
         return []
 
+    @staticmethod
+    def _accept_candidate(code: str, category: str, is_series: bool) -> bool:
+        if is_series and code.startswith("KVM"):
+            return False
+        if category == "movie" and code.startswith("KVP"):
+            return False
+        return True
+
+    def _resolve_from_index(
+        self,
+        titles: list[str],
+        category: str,
+        year: int,
+        file_title: str,
+        path_title: str | None,
+        provider: str | None = None,
+        is_series: bool = False,
+    ) -> dict | None:
+        """제목 색인에서 충분히 일치하는 후보를 찾으면 반환 (없거나 불확실하면 None)"""
+        if self.title_index is None or not len(self.title_index):
+            return None
+        for cat in sorted(["ftv", "ktv", "movie"], key=lambda x: x != category):
+            pool: dict[str, dict] = {}
+            for title in titles:
+                for cand in self.title_index.search(title, cat):
+                    if self._accept_candidate(cand["code"], category, is_series):
+                        pool.setdefault(cand["code"], cand)
+            if not pool:
+                continue
+            best = self._select_best_result(
+                list(pool.values()),
+                file_title=file_title,
+                path_title=path_title,
+                year=year,
+                provider=provider,
+            )
+            # "비밀의 숲" 과 "비밀의 숲 2" 처럼 한쪽이 다른 쪽을 포함하는 제목은
+            # 검색 없이 확정하지 않음
+            norm_cands = [normalize_title(str(c)) for c in best.get("titles") or ()]
+            confidence = max(
+                (
+                    strict_similarity(normalize_title(title), norm_cand)
+                    for title in titles
+                    for norm_cand in norm_cands
+                ),
+                default=0.0,
+            )
+            year_conflict = bool(
+                get_int(year, 0) > 1900
+                and best.get("year")
+                and best.get("year") != get_int(year, 0)
+            )
+            # 색인에는 선택된 코드만 있으므로 다른 사이트의 코드면 검색해서 가산점을 반영
+            provider_mismatch = bool(provider and best.get("site") != provider)
+            logger.debug(
+                f"Title index: code='{best.get('code')}' {confidence=:.3f} {year_conflict=} {provider_mismatch=}"
+            )
+            if (
+                confidence >= self.settings.broadcast.title_index.min_score
+                and not year_conflict
+                and not provider_mismatch
+            ):
+                return best
+            return None
+        return None
+
     async def _find_candidate_pool(
         self, titles: list[str], category: str, year: int, is_series: bool = False
     ) -> list[dict]:
+        """카테고리, 제목, 키워드 순서로 처음 후보가 나오는 검색 결과를 모음
+
+        카테고리 안의 검색은 동시에 시작하고 결과는 우선순위 순서대로 확인합니다.
+        다음 카테고리는 앞 카테고리에서 찾지 못했거나 ``search_hedge_delay`` 가
+        지나도록 앞 카테고리 검색이 끝나지 않으면 시작합니다.
+        더 이상 필요 없는 검색은 취소합니다.
+        후보를 찾지 못했고 실패한 검색이 있으면 ``MetadataSearchError`` 를 발생시킵니다.
+        """
         search_categories = sorted(["ftv", "ktv", "movie"], key=lambda x: x != category)
-        for cat in search_categories:
-            pool: list[dict] = []
-            seen: set[str] = set()
+        keywords = {
+            title: list(dict.fromkeys(self.settings.broadcast.get_search_keywords(title)))
+            for title in titles
+        }
+        searches: dict[tuple[str, str], asyncio.Task] = {}
+
+        def launch(cat: str) -> None:
             for title in titles:
-                for cand in await self._search_candidates(title, cat, year):
-                    code = cand.get("code", "")
-                    if is_series and code.startswith("KVM"):
-                        continue
-                    if category == "movie" and code.startswith("KVP"):
-                        continue
-                    if not code or code not in seen:
-                        if code:
-                            seen.add(code)
-                        pool.append(cand)
-            if pool:
-                return pool
-        return []
+                for kw in keywords[title]:
+                    if (cat, kw) not in searches:
+                        searches[(cat, kw)] = asyncio.create_task(
+                            self._search_candidates(kw, cat, year)
+                        )
+
+        async def hedge(delay: float) -> None:
+            for cat in search_categories[1:]:
+                await asyncio.sleep(delay)
+                launch(cat)
+
+        hedge_delay = self.settings.broadcast.search_hedge_delay
+        hedger = asyncio.create_task(hedge(hedge_delay)) if hedge_delay > 0 else None
+        failed = False
+        try:
+            for cat in search_categories:
+                launch(cat)
+                pool: list[dict] = []
+                seen: set[str] = set()
+                for idx, title in enumerate(titles):
+                    title_keywords = keywords[title]
+                    candidates: list[dict] | None = []
+                    for pos, kw in enumerate(title_keywords):
+                        candidates = await searches[(cat, kw)]
+                        if candidates is None:
+                            failed = True
+                        elif candidates:
+                            # 뒤에 남은 제목에서 사용하지 않는 키워드 검색은 취소
+                            needed = {
+                                k for t in titles[idx + 1 :] for k in keywords[t]
+                            }
+                            for rest in title_keywords[pos + 1 :]:
+                                if rest not in needed:
+                                    searches[(cat, rest)].cancel()
+                            break
+                    for cand in candidates or ():
+                        code = cand.get("code", "")
+                        if not self._accept_candidate(code, category, is_series):
+                            continue
+                        if not code or code not in seen:
+                            if code:
+                                seen.add(code)
+                            pool.append(cand)
+                if pool:
+                    return pool
+            if failed:
+                raise MetadataSearchError("Some metadata searches failed")
+            return []
+        finally:
+            tasks = [*searches.values(), *((hedger,) if hedger else ())]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _fetch_target_metadata(
+        self, target: dict[str, Any], is_series: bool | None = None
+    ) -> dict[str, Any]:
+        """``_parse_downloader_path`` 결과로 메타데이터를 조회"""
+        return await self._fetch_metadata(
+            target["path"],
+            target["category"],
+            file_title=target["file_title"],
+            path_title=target["path_title"],
+            year=target["year"],
+            is_series=target["is_series"] if is_series is None else is_series,
+        )
+
+    @staticmethod
+    def _is_folder_title(path_title: str | None, metadata: dict) -> bool:
+        """폴더명이 조회된 작품의 제목인지 (장르 폴더 등에 바로 저장된 파일은 아님)"""
+        if not path_title or not metadata:
+            return False
+        norm_titles = [
+            normalize_title(str(metadata[k]))
+            for k in TITLE_KEYS
+            if isinstance(metadata.get(k), str)
+        ]
+        return best_similarity(normalize_title(path_title), norm_titles) >= SERIES_FOLDER_MIN_SCORE
 
     async def _fetch_metadata(
         self,
@@ -254,21 +804,62 @@ class BroadcastService:
         elif path.stem.endswith("-ST"):
             provider = "tving"
 
-        ttl_seconds = getattr(
-            getattr(self.settings, "broadcast", None), "metadata_cache_ttl", 300
-        )
-        return await self._query_metadata(
-            category=category,
-            file_title=file_title,
-            path_title=path_title,
-            year=year,
-            tmdb_id=self.settings.tmdb.get_tmdb_id(str(path)),
-            provider=provider,
-            is_series=is_series,
-            ttl_hash=get_ttl_hash(ttl_seconds),
-        )
+        tmdb_id = self.settings.tmdb.get_tmdb_id(str(path))
+        series_key = None
+        if is_series and not tmdb_id:
+            folder, folder_title, _ = self._find_title_folder(path)
+            if folder and folder_title:
+                series_key = make_cache_key(
+                    (str(folder), normalize_title(folder_title), category), {}
+                )
+                if code := self._get_series_code(series_key):
+                    logger.debug(f"Series code: {code=} {folder=}")
+                    try:
+                        if metadata := await self._lookup_metadata(code):
+                            return metadata
+                    except MetadataSearchError as e:
+                        logger.warning(f"Metadata is unavailable: {code=} {e}")
+                        return {}
+
+        try:
+            metadata = await self._query_metadata(
+                category=category,
+                file_title=file_title,
+                path_title=path_title,
+                year=year,
+                tmdb_id=tmdb_id,
+                provider=provider,
+                is_series=is_series,
+            )
+        except MetadataSearchError as e:
+            logger.warning(f"Metadata is unavailable: {file_title=} {path_title=} {e}")
+            return {}
+        if series_key and (code := metadata.get("code")):
+            # 장르 폴더 등에 바로 저장된 파일은 폴더명이 작품 제목이 아니므로 제외
+            if self._is_folder_title(path_title, metadata):
+                self._set_series_code(series_key, code)
+        return metadata
+
+    def _get_series_code(self, key: str) -> str | None:
+        if (code := self._series_codes.get(key)) is not MISSING:
+            return code
+        if self.persistent_cache and (code := self.persistent_cache.get("series", key)):
+            self._series_codes.set(key, code)
+            return code
+        return None
+
+    def _set_series_code(self, key: str, code: str) -> None:
+        self._series_codes.set(key, code)
+        if self.persistent_cache:
+            try:
+                self.persistent_cache.set(
+                    "series", key, code, ttl=self._series_codes.ttl
+                )
+            except Exception:
+                logger.exception(f"Failed to store series code: {code=}")
 
     @apply_cache
+    @apply_persistent_cache("query")
     async def _query_metadata(
         self,
         category: str,
@@ -278,9 +869,7 @@ class BroadcastService:
         tmdb_id: str | None,
         provider: str | None = None,
         is_series: bool = False,
-        ttl_hash: int = 300,
     ) -> dict[str, Any]:
-        _ = ttl_hash
         if tmdb_id:
             code_prefix = "MT" if category == "movie" else "FT"
             return await self._lookup_metadata(f"{code_prefix}{tmdb_id}")
@@ -291,6 +880,17 @@ class BroadcastService:
             if clean_path.lower() != file_title.strip().lower():
                 titles.append(clean_path)
 
+        if best := self._resolve_from_index(
+            titles,
+            category,
+            year,
+            file_title=file_title,
+            path_title=path_title,
+            provider=provider,
+            is_series=is_series,
+        ):
+            return await self._lookup_metadata(best["code"])
+
         candidates = await self._find_candidate_pool(
             titles, category, year, is_series=is_series
         )
@@ -298,7 +898,7 @@ class BroadcastService:
             logger.warning(f"No search results: {file_title=} {path_title=} {year=}")
             return {}
 
-        best = self._select_best_result(
+        best = await self._choose_best_result(
             candidates,
             file_title=file_title,
             path_title=path_title,
@@ -306,7 +906,10 @@ class BroadcastService:
             provider=provider,
         )
         if isinstance(best, dict) and (code := best.get("code")):
-            return await self._lookup_metadata(code)
+            metadata = await self._lookup_metadata(code)
+            if metadata and self.title_index is not None:
+                self.title_index.add(best, get_code_category(code))
+            return metadata
 
         logger.warning(f"No code: {file_title=} {path_title=} {best=}")
         return {}
@@ -322,52 +925,50 @@ class BroadcastService:
         valid = [r for r in results if isinstance(r, dict)]
         if not valid:
             return {}
+        scored_items = score_candidates(
+            [compact_candidate(r) for r in valid], file_title, path_title, year, provider
+        )
+        return self._pick_scored_result(valid, scored_items)
 
-        scored_items = []
-        for idx, item in enumerate(valid):
-            candidates = item.get("titles") or {item.get("title")}
-            p_score = (
-                max((calc_similarity(path_title, c) for c in candidates), default=0.0)
-                if path_title
-                else 0.0
-            )
-            f_score = (
-                max((calc_similarity(file_title, c) for c in candidates), default=0.0)
-                if file_title
-                else 0.0
-            )
-            item_score = max(p_score * 1.1, f_score)
-
-            try:
-                if year and int(year) > 1900 and item.get("year") == int(year):
-                    item_score += 0.15
-            except (ValueError, TypeError):
-                pass
-
-            provider_score = 0.0
-            if provider and item.get("site") == provider:
-                provider_score = 0.2
-                item_score += provider_score
-
-            scored_items.append((item_score, -idx, p_score, f_score, provider_score, item))
-
-        scored_items.sort(key=lambda x: (x[0], x[1]))
+    async def _choose_best_result(
+        self,
+        results: list[dict],
+        file_title: str | None = None,
+        path_title: str | None = None,
+        year: int = 1900,
+        provider: str | None = None,
+    ) -> dict:
+        """``_select_best_result`` 와 같으며 후보가 많으면 프로세스 풀에서 점수를 계산"""
+        valid = [r for r in results if isinstance(r, dict)]
+        if not valid:
+            return {}
+        scored_items = await self._run_cpu_bound(
+            len(valid) >= self.settings.broadcast.process_pool.min_candidates,
+            score_candidates,
+            [compact_candidate(r) for r in valid],
+            file_title,
+            path_title,
+            year,
+            provider,
+        )
+        return self._pick_scored_result(valid, scored_items)
 
-        for item_score, _, p_score, f_score, provider_score, item in scored_items:
+    def _pick_scored_result(
+        self, valid: list[dict], scored_items: list[tuple[float, int, float, float, float]]
+    ) -> dict:
+        for item_score, neg_idx, p_score, f_score, provider_score in scored_items:
+            item = valid[-neg_idx]
             logger.debug(
                 f"total={item_score:.3f} path={p_score:.3f} file={f_score:.3f} provider={provider_score:.3f} "
                 f"code='{item.get('code')}' site='{item.get('site')}' title='{item.get('title')}'"
             )
+        return valid[-scored_items[-1][1]]
 
-        return scored_items[-1][5]
-
+    @apply_cache
     async def _search_metadata(
         self, keyword: str, category: str = "ktv", year: int = 1900
     ) -> dict | list:
         logger.debug(f"Search metadata: {keyword=} {category=}")
-        if not self.session or self.session.closed:
-            logger.error("Session is not initialized...")
-            return {}
         api_path = f"/metadata/api/{category}/search"
         query = {
             "call": "plex",
@@ -380,52 +981,44 @@ class BroadcastService:
                 query["year"] = int(year)
         except (ValueError, TypeError):
             pass
-        url = urljoin(self.settings.flaskfarm.url, f"{api_path}?{urlencode(query)}")
         try:
-            async with self.session.post(
-                url, data={"apikey": self.settings.flaskfarm.apikey}
-            ) as response:
-                search_result = await response.json()
-                if search_result:
-                    return search_result
-        except Exception:
+            # 캐시나 같은 검색을 기다리는 호출이 아닌 실제 요청에만 동시 요청 수 제한
+            async with self._search_limiter:
+                search_result = await self.client.post(api_path, query)
+            if search_result:
+                return search_result
+        except CircuitOpenError as e:
+            logger.warning(f"Metadata searching skipped: {keyword=} {e}")
+            raise MetadataSearchError(str(e)) from e
+        except Exception as e:
             logger.exception(
                 f"Metadata searching failed: {keyword=} {category=} {year=}"
             )
+            raise MetadataSearchError(repr(e)) from e
         return {}
 
     @apply_cache
-    async def _lookup_metadata(self, code: str, ttl_hash: int = 300) -> dict:
-        _ = ttl_hash
+    @apply_persistent_cache("lookup")
+    async def _lookup_metadata(self, code: str) -> dict:
         if not isinstance(code, str) or len(code) < 1:
             logger.warning(f"{code=}")
             return {}
-        match code[0]:
-            case "M":
-                category = "movie"
-            case "F":
-                category = "ftv"
-            case _:
-                category = "ktv"
+        category = get_code_category(code)
         logger.debug(f"Lookup metadata: {code=} {category=}")
-        if not self.session:
-            logger.error("Session is not initialized...")
-            return {}
         api_path = f"/metadata/api/{category}/info"
         query = {
             "call": "plex",
             "manual": "True",
             "code": code,
         }
-        url = urljoin(self.settings.flaskfarm.url, f"{api_path}?{urlencode(query)}")
         try:
-            async with self.session.post(
-                url, data={"apikey": self.settings.flaskfarm.apikey}
-            ) as response:
-                return await response.json()
-        except Exception:
+            return await self.client.post(api_path, query)
+        except CircuitOpenError as e:
+            logger.warning(f"Metadata lookup skipped: {code=} {e}")
+            raise MetadataSearchError(str(e)) from e
+        except Exception as e:
             logger.exception(f"Metadata lookup failed: {code=}")
-        return {}
+            raise MetadataSearchError(repr(e)) from e
 
     def _build_movie_data(
         self,
@@ -543,12 +1136,6 @@ class BroadcastService:
             },
         }
 
-    def _pad(self, text: str) -> bytes:
-        text_bytes = text.encode("utf-8")
-        pad_len = AES.block_size - (len(text_bytes) % AES.block_size)
-        padding = bytes([pad_len] * pad_len)
-        return text_bytes + padding
-
     def _unpad(self, padded_data: bytes) -> bytes:
         if not padded_data:
             return b""
@@ -558,13 +1145,12 @@ class BroadcastService:
         return padded_data[:-pad_len]
 
     def encrypt(self, content: str, key: str) -> str:
-        content_bytes = self._pad(content)
-        key_bytes = key.encode()
-        iv = Random.new().read(AES.block_size)
-        cipher = AES.new(key_bytes, AES.MODE_CBC, iv)
-        encrypted_bytes = cipher.encrypt(content_bytes)
-        result = base64.b64encode(iv + encrypted_bytes)
-        return result.decode()
+        return crypto.encrypt(content, key)
+
+    def encrypt_payloads(self, payloads: Sequence[Any]) -> list[str]:
+        """페이로드를 암호화해서 메시지 형식으로 반환 (같은 순서)"""
+        key = self.settings.broadcast.encrypt.key
+        return [f"```^{encrypted}```" for encrypted in crypto.encrypt_payloads(payloads, key)]
 
     def decrypt(self, encoded: str, key: str) -> str:
         try:
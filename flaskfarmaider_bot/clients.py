@@ -0,0 +1,136 @@
+import time
+import asyncio
+import logging
+from typing import Any
+from urllib.parse import urljoin, urlencode
+
+import aiohttp
+
+from .models import FlaskfarmServer
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """연속된 실패로 요청을 보내지 않는 상태"""
+
+
+class CircuitBreaker:
+    """``threshold`` 번 연속 실패하면 ``cooldown`` 초 동안 요청을 차단
+
+    차단 시간이 지나면 요청 하나를 시험삼아 보내고 성공하면 차단을 해제합니다.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0) -> None:
+        self.threshold = max(threshold, 1)
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.failures < self.threshold:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.cooldown:
+            return "open"
+        return "half-open"
+
+    def before(self) -> None:
+        match self.state:
+            case "open":
+                raise CircuitOpenError(
+                    f"Circuit is open for {self.cooldown - (time.monotonic() - self.opened_at):.1f}s"
+                )
+            case "half-open":
+                if self._probing:
+                    raise CircuitOpenError("Circuit is half-open")
+                self._probing = True
+
+    def success(self) -> None:
+        if self.failures >= self.threshold:
+            logger.info("Circuit closed")
+        self.failures = 0
+        self._probing = False
+
+    def cancel(self) -> None:
+        """결과를 알 수 없이 취소된 요청"""
+        self._probing = False
+
+    def failure(self) -> None:
+        self._probing = False
+        self.failures += 1
+        if self.failures >= self.threshold:
+            if self.failures == self.threshold:
+                self.trips += 1
+            logger.warning(f"Circuit opened for {self.cooldown}s: failures={self.failures}")
+            self.opened_at = time.monotonic()
+
+
+class FlaskfarmClient:
+    """flaskfarm API 요청용 HTTP 클라이언트
+
+    연결을 재사용하는 세션에 시간 제한과 DNS 캐시를 적용하고
+    연속해서 실패하면 차단기로 요청을 바로 실패시킵니다.
+    """
+
+    def __init__(self, settings: FlaskfarmServer) -> None:
+        self.settings = settings
+        self.breaker = CircuitBreaker(settings.breaker_threshold, settings.breaker_cooldown)
+        self.session: aiohttp.ClientSession | None = None
+        self.requests = 0
+        self.errors = 0
+
+    def get_session(self) -> aiohttp.ClientSession:
+        if not self.session or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.settings.pool_size,
+                limit_per_host=self.settings.pool_size,
+                ttl_dns_cache=self.settings.dns_cache_ttl,
+                use_dns_cache=self.settings.dns_cache_ttl > 0,
+                keepalive_timeout=self.settings.keepalive_timeout,
+            )
+            timeout = aiohttp.ClientTimeout(
+                total=self.settings.total_timeout,
+                connect=self.settings.connect_timeout,
+                sock_read=self.settings.read_timeout,
+            )
+            self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self.session
+
+    async def post(self, api_path: str, query: dict[str, Any]) -> Any:
+        """API 경로에 apikey 를 POST 하고 JSON 응답을 반환"""
+        self.breaker.before()
+        self.requests += 1
+        url = urljoin(self.settings.url, f"{api_path}?{urlencode(query)}")
+        try:
+            async with self.get_session().post(
+                url, data={"apikey": self.settings.apikey}
+            ) as response:
+                if response.status >= 500:
+                    response.raise_for_status()
+                result = await response.json(content_type=None)
+        except asyncio.CancelledError:
+            self.breaker.cancel()
+            raise
+        except Exception:
+            self.errors += 1
+            self.breaker.failure()
+            raise
+        self.breaker.success()
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.breaker.state,
+            "failures": self.breaker.failures,
+            "trips": self.breaker.trips,
+            "requests": self.requests,
+            "errors": self.errors,
+        }
+
+    async def close(self) -> None:
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
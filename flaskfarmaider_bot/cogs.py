@@ -9,6 +9,8 @@ from typing import Callable, TYPE_CHECKING
 import discord
 from discord.ext import commands
 
+from .queues import QueueFullError, QueueClosedError
+
 if TYPE_CHECKING:
     from .bot import FlaskfarmaiderBot
 
@@ -66,8 +68,8 @@ class DownloaderBroadcastCog(commands.Cog, name="다운로더-방송"):
                 f"리소스 ID가 올바른지 확인해 주세요.```{str(resource_id)}```"
             )
             return
-        await self.bot.broadcast_queue.put(
-            (
+        try:
+            await self.bot.broadcast_queue.put(
                 "downloader",
                 {
                     "path": str(target_path),
@@ -75,8 +77,16 @@ class DownloaderBroadcastCog(commands.Cog, name="다운로더-방송"):
                     "total_size": total_size,
                     "file_count": file_count,
                 },
+                source="command",
             )
-        )
+        except QueueClosedError:
+            await ctx.reply("봇이 종료 중입니다. 잠시 후에 다시 시도해 주세요.")
+            return
+        except QueueFullError:
+            await ctx.reply(
+                f"방송 대기열이 가득 찼습니다. {self.bot.settings.broadcast.queue.retry_after}초 후에 다시 시도해 주세요."
+            )
+            return
         await ctx.reply(
             f"방송 대기열에 추가했습니다.```GDS 경로: {str(target_path)}\n리소스 ID: {resource_id}\n총 용량: {total_size}\n파일 개수: {file_count}```"
         )
@@ -119,6 +129,7 @@ class GDSBroadcastCog(commands.Cog, name="변경사항-방송"):
                     return
                 invalid_paths = list()
                 valid_paths = list()
+                rejected_paths = list()
                 for target in targets:
                     target_path = Path(target)
                     if (
@@ -129,9 +140,13 @@ class GDSBroadcastCog(commands.Cog, name="변경사항-방송"):
                         invalid_paths.append(target)
                     elif target == "/ROOT/GDRIVE" or target.startswith("/ROOT/GDRIVE/"):
                         logger.debug(f"author={ctx.author.name} {mode=} {target=}")
-                        await self.bot.broadcast_queue.put(
-                            ("gds", {"path": target, "mode": mode})
-                        )
+                        try:
+                            await self.bot.broadcast_queue.put(
+                                "gds", {"path": target, "mode": mode}, source="command"
+                            )
+                        except QueueFullError:
+                            rejected_paths.append(target)
+                            continue
                         valid_paths.append(target)
                     else:
                         invalid_paths.append(target)
@@ -140,6 +155,16 @@ class GDSBroadcastCog(commands.Cog, name="변경사항-방송"):
                     await ctx.reply(
                         f"경로 및 파일 형식을 확인해 주세요.```{invalid_msg}```"
                     )
+                if rejected_paths:
+                    rejected_msg = "\n".join(rejected_paths)
+                    reason = (
+                        "방송 대기열이 가득 찼습니다."
+                        if self.bot.broadcast_queue.accepting
+                        else "봇이 종료 중입니다."
+                    )
+                    await ctx.reply(
+                        f"{reason} 잠시 후에 다시 시도해 주세요.```{rejected_msg}```"
+                    )
                 if valid_paths:
                     valid_msg = "\n".join(valid_paths)
                     await ctx.reply(f"방송 대기열에 추가했습니다.```{valid_msg}```")
@@ -268,6 +293,71 @@ class AdminCog(commands.Cog, name="관리"):
 
         return None
 
+    @commands.command(
+        name="dead-letters", aliases=["dlq"], brief="전송에 실패한 방송 목록을 조회합니다."
+    )
+    @commands.cooldown(2, 3.0, commands.BucketType.user)
+    async def show_dead_letters(
+        self,
+        ctx: commands.Context,
+        limit: int = commands.parameter(
+            default=10,
+            displayed_name="개수",
+            description="조회할 항목 개수",
+        ),
+    ) -> None:
+        """전송에 실패한 방송 목록을 조회합니다."""
+        store = self.bot.send_scheduler.dead_letters
+        count = store.count()
+        if not count:
+            await ctx.reply("전송에 실패한 방송이 없습니다.")
+            return
+        lines = [
+            f"- {entry['id']}: 채널 {entry['channel_id']}, 시도 {entry['attempts']}회, {entry['error']}"
+            for entry in store.entries(limit=max(min(limit, 30), 1))
+        ]
+        entries_text = "\n".join(lines)
+        await ctx.reply(f"전송에 실패한 방송 {count}개:```{entries_text}```")
+
+    @commands.command(
+        name="replay-dead-letters",
+        aliases=["dlq-replay"],
+        brief="전송에 실패한 방송을 다시 전송합니다.",
+    )
+    @commands.cooldown(1, 10.0, commands.BucketType.user)
+    async def replay_dead_letters(
+        self,
+        ctx: commands.Context,
+        *ids: int,
+    ) -> None:
+        """전송에 실패한 방송을 다시 전송합니다. ID를 생략하면 전체를 다시 전송합니다."""
+        futures = self.bot.send_scheduler.replay_dead_letters(list(ids) or None)
+        if not futures:
+            await ctx.reply("다시 전송할 방송이 없습니다.")
+            return
+        await ctx.reply(f"{len(futures)}개의 방송을 다시 전송합니다.")
+
+    @commands.command(
+        name="clear-cache",
+        brief="메타데이터 캐시를 삭제합니다.",
+    )
+    @commands.cooldown(1, 10.0, commands.BucketType.user)
+    async def clear_cache(
+        self,
+        ctx: commands.Context,
+        scope: str = commands.parameter(
+            default="negative",
+            displayed_name="범위",
+            description="negative: 검색 결과가 없었던 항목, all: 전체",
+        ),
+    ) -> None:
+        """메타데이터 캐시를 삭제합니다."""
+        if not self.bot.broadcast_service:
+            await ctx.reply("방송 서비스가 준비되지 않았습니다.")
+            return
+        count = self.bot.broadcast_service.clear_metadata_cache(scope != "all")
+        await ctx.reply(f"메타데이터 캐시 {count}개를 삭제했습니다.")
+
     @commands.command(name="roles", aliases=["app-roles", "bot-roles"], brief="대상 앱(봇)의 현재 역할 목록을 조회합니다.")
     @commands.cooldown(2, 3.0, commands.BucketType.user)
     async def show_roles(
@@ -0,0 +1,439 @@
+import sys
+import copy
+import json
+import time
+import zlib
+import sqlite3
+import logging
+import functools
+from pathlib import Path
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+
+def _readonly(self: Any, *args: Any, **kwds: Any) -> None:
+    raise TypeError(f"'{type(self).__name__}' object is immutable")
+
+
+class FrozenDict(dict):
+    """수정할 수 없는 dict
+
+    캐시된 값을 복사하지 않고 공유하기 위해 사용합니다.
+    ``copy.deepcopy`` 는 수정 가능한 dict 를 반환합니다.
+    """
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self) -> tuple:
+        return (type(self), (dict(self),))
+
+
+class FrozenList(list):
+    """수정할 수 없는 list
+
+    ``copy.deepcopy`` 는 수정 가능한 list 를 반환합니다.
+    """
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = remove = pop = clear = sort = reverse = _readonly
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict) -> list:
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self) -> tuple:
+        return (type(self), (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """dict, list, set 을 재귀적으로 수정할 수 없는 값으로 변환"""
+    if isinstance(value, (FrozenDict, FrozenList, frozenset)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    if isinstance(value, tuple):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def estimate_size(value: Any) -> int:
+    """값이 차지하는 대략적인 메모리 크기(바이트)"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += estimate_size(key) + estimate_size(item)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item)
+    return size
+
+
+class LRUCache:
+    """항목 수와 크기(바이트)가 제한된 LRU 캐시
+
+    항목마다 저장된 시점부터 ``ttl`` 초가 지나면 만료되고
+    저장된 값은 수정할 수 없는 값으로 변환되어 복사 없이 반환됩니다.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        max_bytes: int = 0,
+        ttl: float = 300,
+        negative_ttl: float = 0,
+    ) -> None:
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced = 0
+        self._data: OrderedDict[Hashable, tuple[float, int, Any]] = OrderedDict()
+        self._negative: set[Hashable] = set()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def configure(
+        self,
+        maxsize: int | None = None,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+        negative_ttl: float | None = None,
+    ) -> None:
+        if maxsize is not None:
+            self.maxsize = maxsize
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        if ttl is not None:
+            self.ttl = ttl
+        if negative_ttl is not None:
+            self.negative_ttl = negative_ttl
+        self._shrink()
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        if entry[0] <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: float | None = None,
+        negative: bool = False,
+    ) -> Any:
+        """값을 저장하고 저장된 (수정할 수 없는) 값을 반환
+
+        ``negative`` 는 결과가 없었다는 것을 저장하는 항목이며 ``clear_negative`` 로 따로 삭제할 수 있습니다.
+        """
+        value = freeze(value)
+        if key in self._data:
+            self._remove(key)
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return value
+        size = estimate_size(value)
+        if self.max_bytes > 0 and size > self.max_bytes:
+            return value
+        self._data[key] = (time.monotonic() + ttl, size, value)
+        self.size += size
+        if negative:
+            self._negative.add(key)
+        self._shrink()
+        return value
+
+    def delete(self, key: Hashable) -> bool:
+        if key not in self._data:
+            return False
+        self._remove(key)
+        return True
+
+    def clear(self) -> int:
+        count = len(self._data)
+        self._data.clear()
+        self._negative.clear()
+        self.size = 0
+        return count
+
+    def clear_negative(self) -> int:
+        count = len(self._negative)
+        for key in list(self._negative):
+            self._remove(key)
+        return count
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._data),
+            "negative": len(self._negative),
+            "bytes": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "coalesced": self.coalesced,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._data.pop(key)
+        self.size -= size
+        self._negative.discard(key)
+
+    def _shrink(self) -> None:
+        while self._data and (
+            (self.maxsize > 0 and len(self._data) > self.maxsize)
+            or (self.max_bytes > 0 and self.size > self.max_bytes)
+        ):
+            key, (_, size, _) = self._data.popitem(last=False)
+            self.size -= size
+            self._negative.discard(key)
+            self.evictions += 1
+
+
+def make_cache_key(args: tuple, kwds: dict) -> str:
+    return json.dumps(
+        [args, kwds],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+
+
+class PersistentCache:
+    """SQLite 파일에 저장하는 키/값 캐시
+
+    값은 압축된 JSON으로 저장되며 항목마다 만료 시간을 가집니다.
+    ``max_entries`` 를 넘으면 가장 오래 사용되지 않은 항목부터 삭제하고,
+    시작할 때 최근에 사용한 ``warm_entries`` 개의 항목을 메모리에 올려둡니다.
+    """
+
+    EVICT_INTERVAL = 100
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttl: float = 86400,
+        max_entries: int = 20000,
+        warm_entries: int = 2000,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max(max_entries, 1)
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "namespace TEXT NOT NULL, "
+            "key TEXT NOT NULL, "
+            "value BLOB NOT NULL, "
+            "expires REAL NOT NULL, "
+            "accessed REAL NOT NULL, "
+            "PRIMARY KEY (namespace, key)) WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+        )
+        self._conn.commit()
+        self._warm: dict[tuple[str, str], tuple[float, bytes]] = {}
+        self._touched: dict[tuple[str, str], float] = {}
+        self.evict()
+        self.warm(warm_entries)
+
+    @staticmethod
+    def dumps(value: Any) -> bytes:
+        return zlib.compress(
+            json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode(
+                "utf-8"
+            )
+        )
+
+    @staticmethod
+    def loads(blob: bytes) -> Any:
+        return json.loads(zlib.decompress(blob))
+
+    def warm(self, limit: int) -> int:
+        """최근에 사용한 항목을 메모리에 올림"""
+        if limit <= 0:
+            return 0
+        rows = self._conn.execute(
+            "SELECT namespace, key, expires, value FROM entries "
+            "WHERE expires > ? ORDER BY accessed DESC LIMIT ?",
+            (time.time(), limit),
+        )
+        for namespace, key, expires, value in rows:
+            self._warm[(namespace, key)] = (expires, value)
+        if self._warm:
+            logger.debug(f"Warmed {len(self._warm)} cache entries: {self.path}")
+        return len(self._warm)
+
+    def get(self, namespace: str, key: str) -> Any | None:
+        now = time.time()
+        entry = self._warm.get((namespace, key))
+        if entry is None:
+            entry = self._conn.execute(
+                "SELECT expires, value FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        if entry is None or entry[0] <= now:
+            self.misses += 1
+            return None
+        try:
+            value = self.loads(entry[1])
+        except Exception:
+            logger.exception(f"Invalid cache entry: {namespace=} {key=}")
+            self.delete(namespace, key)
+            return None
+        self.hits += 1
+        self._touched[(namespace, key)] = now
+        return value
+
+    def set(
+        self, namespace: str, key: str, value: Any, ttl: float | None = None
+    ) -> None:
+        now = time.time()
+        expires = now + (self.ttl if ttl is None else ttl)
+        blob = self.dumps(value)
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, expires, accessed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, blob, expires, now),
+            )
+        if (namespace, key) in self._warm:
+            self._warm[(namespace, key)] = (expires, blob)
+        self._writes += 1
+        if self._writes >= self.EVICT_INTERVAL:
+            self._writes = 0
+            self.evict()
+
+    def delete(self, namespace: str, key: str) -> None:
+        self._warm.pop((namespace, key), None)
+        self._touched.pop((namespace, key), None)
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+
+    def clear(self, namespace: str | None = None) -> int:
+        with self._conn:
+            if namespace is None:
+                cursor = self._conn.execute("DELETE FROM entries")
+                self._warm.clear()
+                self._touched.clear()
+            else:
+                cursor = self._conn.execute(
+                    "DELETE FROM entries WHERE namespace = ?", (namespace,)
+                )
+                for cache_key in [k for k in self._warm if k[0] == namespace]:
+                    del self._warm[cache_key]
+                for cache_key in [k for k in self._touched if k[0] == namespace]:
+                    del self._touched[cache_key]
+        return cursor.rowcount
+
+    def evict(self) -> int:
+        """만료된 항목과 한도를 넘는 오래된 항목을 삭제"""
+        self._flush_touched()
+        with self._conn:
+            deleted = self._conn.execute(
+                "DELETE FROM entries WHERE expires <= ?", (time.time(),)
+            ).rowcount
+            count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            if count > self.max_entries:
+                deleted += self._conn.execute(
+                    "DELETE FROM entries WHERE (namespace, key) IN "
+                    "(SELECT namespace, key FROM entries ORDER BY accessed LIMIT ?)",
+                    (count - self.max_entries,),
+                ).rowcount
+        return deleted
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "entries": self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0],
+            "warm": len(self._warm),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        self._flush_touched()
+        self._conn.close()
+
+    def _flush_touched(self) -> None:
+        if not self._touched:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE entries SET accessed = ? WHERE namespace = ? AND key = ?",
+                (
+                    (accessed, namespace, key)
+                    for (namespace, key), accessed in self._touched.items()
+                ),
+            )
+        self._touched.clear()
+
+
+def apply_persistent_cache(namespace: str, attr: str = "persistent_cache") -> Callable:
+    """인스턴스의 ``attr`` 속성에 지정된 ``PersistentCache`` 에 결과를 저장하는 비동기 메소드 데코레이터"""
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(self: Any, *args: Any, **kwds: Any) -> Any:
+            cache: PersistentCache | None = getattr(self, attr, None)
+            if cache is None:
+                return await func(self, *args, **kwds)
+            key = make_cache_key(args, kwds)
+            if (value := cache.get(namespace, key)) is not None:
+                return value
+            result = await func(self, *args, **kwds)
+            if result:
+                try:
+                    cache.set(namespace, key, result)
+                except Exception:
+                    logger.exception(f"Failed to store cache entry: {namespace=}")
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,97 @@
+"""flaskfarm 의 support.base.aes 와 호환되는 페이로드 직렬화, 암호화
+
+암호문은 ``base64(iv + AES-CBC(key, iv, PKCS7(plaintext)))`` 형식입니다.
+``orjson`` 이 설치되어 있으면 JSON 직렬화에 사용합니다.
+"""
+
+import os
+import json
+import base64
+import functools
+import threading
+from typing import Any, Sequence
+
+from Crypto.Cipher import AES
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BLOCK_SIZE = AES.block_size
+CIPHER_CACHE_SIZE = 8
+
+
+def dumps(data: Any) -> bytes:
+    """공백 없는 UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        data, separators=(",", ":"), ensure_ascii=False, default=str
+    ).encode("utf-8")
+
+
+class PayloadCipher:
+    """키 하나로 여러 페이로드를 암호화
+
+    메시지마다 ``AES.new`` 로 키 스케줄을 만들지 않도록 CBC 암호화 객체 하나를
+    계속 사용합니다. CBC 상태에는 직전 암호문의 마지막 블록이 남아 있으므로 첫
+    블록에 ``iv ^ 직전 블록`` 을 더해서 암호화하면 새 ``iv`` 로 시작한 CBC 와
+    같은 암호문이 됩니다.
+    """
+
+    def __init__(self, key: bytes) -> None:
+        self.key = key
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._chain = os.urandom(BLOCK_SIZE)
+        self._cipher = AES.new(self.key, AES.MODE_CBC, iv=self._chain)
+
+    def encrypt(self, plaintext: bytes) -> str:
+        return self.encrypt_many((plaintext,))[0]
+
+    def encrypt_many(self, plaintexts: Sequence[bytes]) -> list[str]:
+        # IV 는 OS 의 CSPRNG 에서 한 번에 읽음
+        ivs = os.urandom(BLOCK_SIZE * len(plaintexts))
+        results = []
+        with self._lock:
+            try:
+                for idx, plaintext in enumerate(plaintexts):
+                    iv = ivs[idx * BLOCK_SIZE : (idx + 1) * BLOCK_SIZE]
+                    results.append(self._encrypt(iv, plaintext))
+            except BaseException:
+                # 체인 값과 CBC 상태가 어긋났을 수 있음
+                self._reset()
+                raise
+        return results
+
+    def _encrypt(self, iv: bytes, plaintext: bytes) -> str:
+        # 패딩과 첫 블록 보정은 복사본 하나에서 처리
+        # (pycryptodome 의 output= 인자는 버퍼 검사 비용이 복사보다 큼)
+        pad_len = BLOCK_SIZE - len(plaintext) % BLOCK_SIZE
+        buffer = bytearray(plaintext)
+        buffer += bytes((pad_len,)) * pad_len
+        first = int.from_bytes(buffer[:BLOCK_SIZE], "big")
+        mask = int.from_bytes(iv, "big") ^ int.from_bytes(self._chain, "big")
+        buffer[:BLOCK_SIZE] = (first ^ mask).to_bytes(BLOCK_SIZE, "big")
+        encrypted = self._cipher.encrypt(buffer)
+        self._chain = encrypted[-BLOCK_SIZE:]
+        return base64.b64encode(iv + encrypted).decode("ascii")
+
+
+@functools.lru_cache(maxsize=CIPHER_CACHE_SIZE)
+def get_cipher(key: str) -> PayloadCipher:
+    return PayloadCipher(key.encode())
+
+
+def encrypt(content: str | bytes, key: str) -> str:
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return get_cipher(key).encrypt(content)
+
+
+def encrypt_payloads(payloads: Sequence[Any], key: str) -> list[str]:
+    """JSON 으로 직렬화해서 같은 순서로 암호화"""
+    return get_cipher(key).encrypt_many([dumps(payload) for payload in payloads])
@@ -10,6 +10,8 @@ import subprocess
 from pathlib import Path
 from typing import Any, Iterable, Callable, Sequence
 
+from .caches import MISSING, LRUCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -73,37 +75,102 @@ def _make_hashable(obj: Any) -> Any:
     return obj
 
 
-def apply_cache(func: Callable, maxsize: int = 64) -> Callable:
+def apply_cache(
+    func: Callable | None = None,
+    maxsize: int = 64,
+    max_bytes: int = 0,
+    ttl: float = 3600,
+    negative_ttl: float = 0,
+) -> Callable:
+    """결과를 ``LRUCache`` 에 저장하는 데코레이터
+
+    캐시는 ``wrapper.cache`` 로 접근할 수 있고 반환된 값은 수정할 수 없습니다.
+    비동기 함수는 같은 인자로 동시에 호출되면 한 번만 실행하고 결과(또는 예외)를 공유합니다.
+    기다리던 호출이 모두 취소되면 실행 중인 작업도 취소합니다.
+    다른 호출 때문에 공유하던 작업이 취소되면 새로 실행합니다.
+    ``negative_ttl`` 을 지정하면 빈 결과도 그 시간 동안 저장합니다.
+    """
+    if func is None:
+        return functools.partial(
+            apply_cache,
+            maxsize=maxsize,
+            max_bytes=max_bytes,
+            ttl=ttl,
+            negative_ttl=negative_ttl,
+        )
+    cache = LRUCache(maxsize, max_bytes, ttl, negative_ttl)
+
+    def store(key: Any, result: Any) -> Any:
+        if result:
+            return cache.set(key, result)
+        if cache.negative_ttl > 0:
+            return cache.set(key, result, ttl=cache.negative_ttl, negative=True)
+        return result
+
     if asyncio.iscoroutinefunction(func):
-        cache: dict[Any, Any] = {}
+        inflight: dict[Any, asyncio.Task] = {}
+        # 실행 중인 작업별로 결과를 기다리는 호출 수
+        waiters: dict[asyncio.Task, int] = {}
+
+        async def call(key: Any, args: tuple, kwds: dict) -> Any:
+            return store(key, await func(*args, **kwds))
+
+        def finish(key: Any, task: asyncio.Task) -> None:
+            # 시작하기 전에 취소된 작업도 정리되도록 완료 콜백에서 제거
+            if inflight.get(key) is task:
+                del inflight[key]
+            # 기다리던 호출이 모두 취소된 경우 처리되지 않은 예외 경고 방지
+            if not task.cancelled():
+                task.exception()
+
+        def is_cancelling() -> bool:
+            # Task.cancelling() 이 없는 버전에서는 호출한 쪽이 취소된 것으로 간주
+            current = asyncio.current_task()
+            return not hasattr(current, "cancelling") or current.cancelling() > 0
 
         @functools.wraps(func)
-        async def async_wrapper(*args: Any, ttl_hash: int = 3600, **kwds: Any):
-            key = (_make_hashable(args), _make_hashable(kwds), ttl_hash)
-            if key in cache:
-                cached_val = cache[key]
-                return copy.deepcopy(cached_val) if isinstance(cached_val, (dict, list)) else cached_val
-            result = await func(*args, **kwds)
-            if len(cache) >= maxsize:
-                cache.pop(next(iter(cache)))
-            if result:
-                cache[key] = copy.deepcopy(result) if isinstance(result, (dict, list)) else result
-            return result
-
+        async def async_wrapper(*args: Any, **kwds: Any):
+            key = (_make_hashable(args), _make_hashable(kwds))
+            while True:
+                if (cached := cache.get(key)) is not MISSING:
+                    return cached
+                if task := inflight.get(key):
+                    cache.coalesced += 1
+                else:
+                    task = inflight[key] = asyncio.create_task(call(key, args, kwds))
+                    task.add_done_callback(functools.partial(finish, key))
+                waiters[task] = waiters.get(task, 0) + 1
+                try:
+                    # 호출한 쪽이 취소되어도 기다리는 다른 호출이 있으면 작업은 계속 진행
+                    return await asyncio.shield(task)
+                except asyncio.CancelledError:
+                    # 공유하던 작업만 취소된 경우에는 새로 실행
+                    if is_cancelling() or not task.cancelled():
+                        raise
+                finally:
+                    waiters[task] -= 1
+                    if not waiters[task]:
+                        del waiters[task]
+                        if not task.done():
+                            # 취소 중인 작업에 새 호출이 합류하지 않도록 먼저 제거
+                            if inflight.get(key) is task:
+                                del inflight[key]
+                            task.cancel()
+
+        async_wrapper.cache = cache
         return async_wrapper
 
-    @functools.lru_cache(maxsize=maxsize)
-    def wrapper(*args: Any, ttl_hash: int = 3600, **kwds: Any):
-        del ttl_hash
-        return func(*args, **kwds)
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwds: Any):
+        key = (_make_hashable(args), _make_hashable(kwds))
+        if (cached := cache.get(key)) is not MISSING:
+            return cached
+        return store(key, func(*args, **kwds))
 
+    wrapper.cache = cache
     return wrapper
 
 
-def get_ttl_hash(seconds: int = 3600) -> int:
-    return round(time.time() / seconds)
-
-
 async def watch_process(process: subprocess.Popen, stop_flag: threading.Event | asyncio.Event, timeout: int = 300) -> None:
     for i in range(timeout):
         if process.poll() is not None or stop_flag.is_set():
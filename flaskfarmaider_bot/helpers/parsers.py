@@ -1,9 +1,13 @@
 import re
 import sys
+import functools
+import threading
+from typing import Any, Sequence
 
 from PTN.parse import PTN
-from PTN.patterns import patterns, delimiters
-from PTN.extras import link_patterns
+from PTN.patterns import patterns, patterns_ordered, types, patterns_allow_overlap, delimiters
+from PTN.extras import link_patterns, patterns_ignore_title
+from PTN.post import post_processing_after_excess, post_processing_before_excess
 
 patterns["season"].append(
     r"\b(?:Complete"
@@ -110,10 +114,186 @@ class FilenameParser(PTN):
         self.merge_match_slices()
 
 
+class CompiledFilenameParser(FilenameParser):
+    """패턴을 미리 컴파일해서 재사용하는 ``FilenameParser``
+
+    ``PTN.parse`` 와 같은 순서로 같은 패턴을 적용하지만 호출할 때마다 하던
+    패턴 옵션 정리, 정규식 문자열 조합과 ``re`` 캐시 조회를 생략하고
+    제목 이후 위치(``ignore_before_index``)는 파트별로 한 번만 계산합니다.
+    ``PTN.parse`` 의 내부 구현을 따르므로 requirements.txt 의 PTN 버전을 올릴 때는
+    ``python -m benchmarks.parsers`` 로 결과가 같은지 확인해야 합니다.
+    """
+
+    # (파트 이름, 컴파일된 패턴, replace, transforms)
+    compiled_patterns: tuple[tuple[str, re.Pattern, Any, Any], ...] = ()
+    compiled_ignore_title: dict[str, tuple[re.Pattern, ...]] = {}
+
+    def __init__(self) -> None:
+        super().__init__()
+        if not self.compiled_patterns:
+            self.compile_patterns()
+        self.post_title_regex = re.compile(self.post_title_pattern, re.IGNORECASE)
+        self._ignore_indexes: dict[str, int] = {}
+
+    @classmethod
+    def compile_patterns(cls) -> None:
+        compiled = []
+        for key in patterns_ordered:
+            for pattern, replace, transforms in cls.normalise_pattern_options(
+                patterns[key]
+            ):
+                if key not in ("season", "episode", "site", "language", "genre"):
+                    pattern = r"\b(?:{})\b".format(pattern)
+                compiled.append(
+                    (key, re.compile(pattern, re.IGNORECASE), replace, transforms)
+                )
+        cls.compiled_patterns = tuple(compiled)
+        cls.compiled_ignore_title = {
+            key: tuple(re.compile(p, re.IGNORECASE) for p in ignored)
+            for key, ignored in patterns_ignore_title.items()
+        }
+
+    def parse(self, name, standardise, coherent_types):
+        """override"""
+        name = name.strip()
+        self.parts: dict = {}
+        self.part_slices: dict = {}
+        self.torrent_name: str = name
+        self.match_slices: list = []
+        self.standardise: bool = standardise
+        self.coherent_types: bool = coherent_types
+        self._ignore_indexes.clear()
+        clean_name = name.replace("_", " ")
+
+        for key, pattern, replace, transforms in self.compiled_patterns:
+            matches = self.get_matches(pattern, clean_name, key)
+
+            if not matches:
+                continue
+
+            match_index = 0
+            if key == "year":
+                match_index = -1
+
+            match = matches[match_index]["match"]
+            match_start, match_end = (
+                matches[match_index]["start"],
+                matches[match_index]["end"],
+            )
+            if key in self.parts:
+                self._part(key, (match_start, match_end), None, overwrite=False)
+                continue
+
+            index = self.get_match_indexes(match)
+
+            if key in ("season", "episode"):
+                clean = self.get_season_episode(match)
+            elif key == "subtitles":
+                clean = self.get_subtitles(match)
+            elif key in ("language", "genre"):
+                clean = self.split_multi(match)
+            elif key in types.keys() and types[key] == "boolean":
+                clean = True
+            else:
+                clean = match[index["clean"]]
+                if key in types.keys() and types[key] == "integer":
+                    clean = int(clean)
+
+            if self.standardise:
+                clean = self.standardise_clean(clean, key, replace, transforms)
+
+            part_overlaps = False
+            for part, part_slices in self.part_slices.items():
+                if part not in patterns_allow_overlap:
+                    if (part_slices[0] < match_start < part_slices[1]) or (
+                        part_slices[0] < match_end < part_slices[1]
+                    ):
+                        part_overlaps = True
+                        break
+
+            if not part_overlaps:
+                self._part(key, (match_start, match_end), clean)
+
+        self.process_title()
+        self.fix_known_exceptions()
+
+        unmatched = self.get_unmatched()
+        for f in post_processing_before_excess:
+            unmatched = f(self, unmatched)
+
+        cleaned_unmatched = self.clean_unmatched()
+        if cleaned_unmatched:
+            self._part("excess", None, cleaned_unmatched)
+
+        for f in post_processing_after_excess:
+            f(self)
+
+        return self.parts
+
+    def get_matches(self, pattern, clean_name, key):
+        """override"""
+        parsed_matches = []
+        ignore_index = None
+        for m in pattern.finditer(clean_name):
+            if ignore_index is None:
+                ignore_index = self.ignore_before_index(clean_name, key)
+            if m.start() < ignore_index:
+                continue
+            groups = m.groups()
+            parsed_matches.append(
+                {
+                    "match": list(groups) if groups else [m.group()],
+                    "start": m.start(),
+                    "end": m.end(),
+                }
+            )
+        return parsed_matches
+
+    def ignore_before_index(self, clean_name, key):
+        """override"""
+        # parse() 하는 동안 clean_name 은 바뀌지 않으므로 파트별 결과를 재사용
+        if (index := self._ignore_indexes.get(key)) is not None:
+            return index
+        match = None
+        if key in self.compiled_ignore_title:
+            ignored = self.compiled_ignore_title[key]
+            if not ignored or any(p.search(clean_name) for p in ignored):
+                match = self.post_title_regex.search(clean_name)
+        index = match.start() if match else 0
+        self._ignore_indexes[key] = index
+        return index
+
+
+PARSE_CACHE_SIZE = 4096
+_local = threading.local()
+
+
+def get_parser() -> CompiledFilenameParser:
+    """스레드별로 하나씩 만들어 재사용하는 파서"""
+    if (parser := getattr(_local, "parser", None)) is None:
+        parser = _local.parser = CompiledFilenameParser()
+    return parser
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _cached_parse(filename: str, standardise: bool, coherent_types: bool) -> dict:
+    return get_parser().parse(filename, standardise, coherent_types)
+
+
 def filename_parse(
     filename: str, standardise: bool = True, coherent_types: bool = False
 ) -> dict:
-    return FilenameParser().parse(filename, standardise, coherent_types)
+    parts = _cached_parse(filename, standardise, coherent_types)
+    # 캐시된 결과를 호출한 쪽에서 수정해도 영향이 없도록 복사
+    return {
+        key: list(value) if isinstance(value, list) else value
+        for key, value in parts.items()
+    }
+
+
+def parse_filenames(filenames: Sequence[str]) -> list[dict]:
+    """여러 파일명을 순서대로 분석 (프로세스 풀에서 묶음 단위로 실행)"""
+    return [filename_parse(filename) for filename in filenames]
 
 
 if __name__ == "__main__":
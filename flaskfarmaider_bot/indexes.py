@@ -0,0 +1,175 @@
+import json
+import time
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Any, Callable, Iterable
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+
+def make_grams(text: str, size: int = 3) -> set[str]:
+    """문자열의 n-gram 집합 (``size`` 보다 짧으면 문자열 자체)"""
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+class TitleIndex:
+    """제목, 다른 제목, 년도를 메타데이터 코드로 연결하는 trigram 색인
+
+    항목은 ``BroadcastService._normalize_candidate`` 의 후보와 같은 형태이며
+    경로를 지정하면 SQLite 파일에 저장하고 시작할 때 다시 불러옵니다.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = "",
+        normalizer: Callable[[str], str] = str.lower,
+    ) -> None:
+        self.normalizer = normalizer
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.categories: dict[str, str] = {}
+        self._titles: dict[str, set[str]] = defaultdict(set)
+        self._grams: dict[str, set[str]] = defaultdict(set)
+        self._conn: sqlite3.Connection | None = None
+        self.path = Path(path) if path else None
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS titles ("
+                "code TEXT PRIMARY KEY, "
+                "category TEXT NOT NULL, "
+                "data TEXT NOT NULL, "
+                "updated REAL NOT NULL)"
+            )
+            self._conn.commit()
+            for code, category, data in self._conn.execute(
+                "SELECT code, category, data FROM titles"
+            ):
+                try:
+                    self._index(json.loads(data), category)
+                except Exception:
+                    logger.exception(f"Invalid title index entry: {code=}")
+            if self.entries:
+                logger.info(f"Loaded {len(self.entries)} title index entries: {self.path}")
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, candidate: dict[str, Any], category: str) -> bool:
+        return self.add_many(((candidate, category),)) > 0
+
+    def add_many(self, items: Iterable[tuple[dict[str, Any], str]]) -> int:
+        """후보를 색인에 추가하고 추가(갱신)한 개수를 반환"""
+        rows = []
+        for candidate, category in items:
+            if entry := self._index(candidate, category):
+                rows.append(
+                    (
+                        entry["code"],
+                        category,
+                        json.dumps(entry, ensure_ascii=False, separators=(",", ":")),
+                        time.time(),
+                    )
+                )
+        if rows and self._conn:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO titles (code, category, data, updated) "
+                    "VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+        return len(rows)
+
+    def search(
+        self, title: str, category: str, limit: int = 10, min_score: float = 0.3
+    ) -> list[dict[str, Any]]:
+        """``category`` 항목 중 제목의 trigram 이 많이 겹치는 순서로 후보를 반환"""
+        norm_title = self.normalizer(title)
+        if not norm_title:
+            return []
+        scores: dict[str, float] = {}
+        for code in self._titles.get(norm_title, ()):
+            scores[code] = 1.0
+        query_grams = make_grams(norm_title)
+        shared: dict[str, int] = defaultdict(int)
+        for gram in query_grams:
+            for indexed_title in self._grams.get(gram, ()):
+                shared[indexed_title] += 1
+        for indexed_title, count in shared.items():
+            score = 2 * count / (len(query_grams) + len(make_grams(indexed_title)))
+            if score < min_score:
+                continue
+            for code in self._titles[indexed_title]:
+                if score > scores.get(code, 0.0):
+                    scores[code] = score
+        ranked = sorted(
+            (
+                (score, code)
+                for code, score in scores.items()
+                if self.categories.get(code) == category
+            ),
+            key=lambda x: (-x[0], x[1]),
+        )
+        return [self.entries[code] for _, code in ranked[:limit]]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "entries": len(self.entries),
+            "titles": len(self._titles),
+            "grams": len(self._grams),
+        }
+
+    def close(self) -> None:
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    def _index(self, candidate: dict[str, Any], category: str) -> dict[str, Any] | None:
+        code = str(candidate.get("code") or "")
+        titles = {
+            str(title).strip()
+            for title in (candidate.get("titles") or (candidate.get("title"),))
+            if title and str(title).strip()
+        }
+        if not code or not titles:
+            return None
+        self._unindex(code)
+        entry = {
+            "code": code,
+            "title": str(candidate.get("title") or next(iter(titles))),
+            "titles": sorted(titles),
+            "year": candidate.get("year"),
+            "site": candidate.get("site"),
+        }
+        self.entries[code] = entry
+        self.categories[code] = category
+        for title in titles:
+            if not (norm_title := self.normalizer(title)):
+                continue
+            self._titles[norm_title].add(code)
+            for gram in make_grams(norm_title):
+                self._grams[gram].add(norm_title)
+        return entry
+
+    def _unindex(self, code: str) -> None:
+        if not (entry := self.entries.pop(code, None)):
+            return
+        self.categories.pop(code, None)
+        for title in entry["titles"]:
+            norm_title = self.normalizer(title)
+            if not (codes := self._titles.get(norm_title)):
+                continue
+            codes.discard(code)
+            if codes:
+                continue
+            del self._titles[norm_title]
+            for gram in make_grams(norm_title):
+                if (indexed := self._grams.get(gram)) is not None:
+                    indexed.discard(norm_title)
+                    if not indexed:
+                        del self._grams[gram]
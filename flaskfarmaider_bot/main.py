@@ -35,6 +35,7 @@ def main(settings_file: str | os.PathLike | None = None) -> None:
         settings=settings,
         description="flaskfarmaider-bot",
         intents=intents,
+        max_ratelimit_timeout=settings.discord.send.max_ratelimit_timeout,
     )
     bot.run(
         settings.discord.token,
@@ -1,7 +1,7 @@
 import re
 import logging
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field, PrivateAttr
 
@@ -48,9 +48,20 @@ class DiscordCommandConfig(BaseModel):
     prefix: str = "!"
 
 
+class DiscordSendConfig(BaseModel):
+    rate: int = 5
+    per: float = 5.0
+    max_retries: int = 5
+    retry_delay: float = 5.0
+    retry_max_delay: float = 300.0
+    max_ratelimit_timeout: float | None = 30.0
+    dead_letter: str = ""
+
+
 class DiscordConfig(BaseModel):
     token: str = ""
     command: DiscordCommandConfig = Field(default_factory=DiscordCommandConfig)
+    send: DiscordSendConfig = Field(default_factory=DiscordSendConfig)
     auto_roles: dict[int, DiscordAutoRolesConfig] = Field(default_factory=dict)
 
 
@@ -134,11 +145,99 @@ class TmdbConfig(BaseModel):
                     return match.group(1) if match.groups() else None
 
 
+class MetadataCacheConfig(BaseModel):
+    memory_ttl: int = 300
+    memory_entries: int = 256
+    memory_bytes: int = 32 * 1024 * 1024
+    negative_ttl: int = 120
+    series_ttl: int = 86400
+    series_entries: int = 4096
+    path: str = ""
+    ttl: int = 86400
+    max_entries: int = 20000
+    warm_entries: int = 2000
+
+
+class TitleIndexConfig(BaseModel):
+    enabled: bool = False
+    path: str = ""
+    catalogs: tuple[str, ...] = ()
+    min_score: float = 0.9
+
+
+class ProcessPoolConfig(BaseModel):
+    workers: int = 0
+    chunk_size: int = 64
+    min_candidates: int = 50
+
+
+class BroadcastQueueConfig(BaseModel):
+    workers: int = 4
+    concurrency: dict[str, int] = Field(
+        default_factory=lambda: {"gds": 4, "downloader": 2}
+    )
+    max_inflight: int = 256
+    prefetch: int = 16
+    drain_timeout: float = 30.0
+    spill: str = ""
+    journal: str = ""
+    journal_batch: int = 64
+    journal_interval: float = 1.0
+    lanes: dict[str, int] = Field(
+        default_factory=lambda: {"high": 6, "normal": 3, "low": 1}
+    )
+    default_priority: str = "normal"
+    source_priorities: dict[str, str] = Field(
+        default_factory=lambda: {"command": "high"}
+    )
+    mode_priorities: dict[str, str] = Field(
+        default_factory=lambda: {"REFRESH": "low"}
+    )
+    max_depth: int = 0
+    high_water: int = 0
+    shed_policy: Literal["none", "oldest", "lowest"] = "none"
+    retry_after: int = 30
+
+    def model_post_init(self, context: Any, /) -> None:
+        if not self.lanes:
+            self.lanes = {"normal": 1}
+        if self.default_priority not in self.lanes:
+            self.default_priority = next(iter(self.lanes))
+        if self.max_depth > 0 and not 0 < self.high_water <= self.max_depth:
+            self.high_water = self.max_depth
+
+    @property
+    def top_priority(self) -> str:
+        return max(self.lanes, key=lambda lane: self.lanes[lane])
+
+    def get_priority(
+        self,
+        source: str = "",
+        mode: str = "",
+        requested: str | None = None,
+    ) -> str:
+        for priority in (
+            requested,
+            self.source_priorities.get(source),
+            self.mode_priorities.get(mode.upper()),
+        ):
+            if priority and priority in self.lanes:
+                return priority
+        return self.default_priority
+
+
 class BroadcastConfig(BaseModel):
     source: BroadcastSourceConfig
     target: DiscordChannelsConfig
     encrypt: BroadcastEncryptConfig
     relay: dict[int, tuple[BroadcastRelayTargetConfig, ...]] = Field(default_factory=dict)
+    queue: BroadcastQueueConfig = Field(default_factory=BroadcastQueueConfig)
+    metadata_cache: MetadataCacheConfig = Field(default_factory=MetadataCacheConfig)
+    search_concurrency: int = 4
+    search_hedge_delay: float = 1.0
+    title_index: TitleIndexConfig = Field(default_factory=TitleIndexConfig)
+    resolve_concurrency: int = 4
+    process_pool: ProcessPoolConfig = Field(default_factory=ProcessPoolConfig)
 
     module_rules: tuple[ModuleRuleConfig, ...] = ()
     genre_by_subfolders: tuple[str, ...] = ()
@@ -228,6 +327,14 @@ class APIConfig(BaseModel):
 class FlaskfarmServer(BaseModel):
     url: str = "http://localhost:9999"
     apikey: str = ""
+    connect_timeout: float = 5.0
+    read_timeout: float = 15.0
+    total_timeout: float = 30.0
+    pool_size: int = 16
+    keepalive_timeout: float = 30.0
+    dns_cache_ttl: int = 300
+    breaker_threshold: int = 5
+    breaker_cooldown: float = 30.0
 
 
 class AppSettings(_BaseSettings):
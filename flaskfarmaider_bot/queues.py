@@ -0,0 +1,551 @@
+import json
+import time
+import logging
+import asyncio
+import sqlite3
+import posixpath
+from typing import Any, Sequence
+from pathlib import Path
+from collections import deque
+from dataclasses import dataclass, field
+
+from .models import BroadcastQueueConfig
+from .helpers.helpers import get_int
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 차서 작업을 받을 수 없음"""
+
+    def __init__(self, message: str, status: int = 503, retry_after: int = 30) -> None:
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class QueueClosedError(QueueFullError):
+    """종료 중이라 작업을 받을 수 없음"""
+
+
+@dataclass(slots=True, eq=False)
+class BroadcastJob:
+    """방송 대기열에 들어가는 작업 단위"""
+
+    handler: str
+    data: dict = field(default_factory=dict)
+    id: int = 0
+    priority: str = ""
+    created: float = field(default_factory=time.monotonic)
+    key: tuple[str, str] = field(init=False, default=("", ""))
+
+    def __post_init__(self) -> None:
+        # 중복 작업과 처리 순서를 판별하기 위한 (방송 종류, 정규화된 경로)
+        path = self.path
+        self.key = (self.handler, posixpath.normpath(path) if path else "")
+
+    @property
+    def path(self) -> str:
+        return str(self.data.get("path") or "")
+
+    @property
+    def extra(self) -> str:
+        return str(self.data.get("mode") or self.data.get("item") or "")
+
+    def merge(self, other: "BroadcastJob") -> None:
+        if "items" in self.data or "items" in other.data:
+            # 묶음 작업은 같은 파일은 나중 값으로 바꾸고 새 파일은 뒤에 추가
+            items = {
+                (it.get("path"), it.get("item")): it
+                for it in (*self.data.get("items", ()), *other.data.get("items", ()))
+            }
+            self.data["items"] = list(items.values())
+            return
+        for key in ("file_count", "total_size"):
+            if key in self.data or key in other.data:
+                self.data[key] = max(
+                    get_int(self.data.get(key)), get_int(other.data.get(key))
+                )
+
+
+class BroadcastJournal:
+    """방송 작업을 디스크에 기록하는 SQLite(WAL) 저널
+
+    작업은 대기열에 들어갈 때 바로 기록(커밋)되고 전송이 완료되면 삭제됩니다.
+    삭제는 메모리에 모아 두었다가 ``batch_size`` 개 단위 혹은 ``flush()``
+    호출시 한 번의 트랜잭션으로 기록합니다. 삭제가 기록되기 전에 종료되면
+    다음 실행시 해당 작업을 한 번 더 처리합니다.
+    """
+
+    def __init__(self, path: str | Path, batch_size: int = 64) -> None:
+        self.path = Path(path)
+        self.batch_size = max(batch_size, 1)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL 모드에서는 체크포인트 시점에만 fsync
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id INTEGER PRIMARY KEY, "
+            "handler TEXT NOT NULL, "
+            "data TEXT NOT NULL, "
+            "created REAL NOT NULL)"
+        )
+        self._conn.commit()
+        row = self._conn.execute("SELECT MAX(id) FROM jobs").fetchone()
+        self._last_id: int = row[0] or 0
+        self._deletes: set[int] = set()
+
+    def append(self, job: BroadcastJob) -> int:
+        # 응답하기 전에 커밋해야 비정상 종료시에도 작업이 남음
+        # (WAL + synchronous=NORMAL 이라 커밋마다 fsync 하지는 않음)
+        self._last_id += 1
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, handler, data, created) VALUES (?, ?, ?, ?)",
+                (self._last_id, job.handler, json.dumps(job.data, default=str), time.time()),
+            )
+        return self._last_id
+
+    def update(self, job: BroadcastJob) -> None:
+        if not job.id:
+            return
+        with self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET data = ? WHERE id = ?",
+                (json.dumps(job.data, default=str), job.id),
+            )
+
+    def ack(self, job: BroadcastJob) -> None:
+        if not job.id:
+            return
+        self._deletes.add(job.id)
+        if len(self._deletes) >= self.batch_size:
+            self.flush()
+
+    def pending(self) -> list[BroadcastJob]:
+        self.flush()
+        jobs = []
+        for job_id, handler, data in self._conn.execute(
+            "SELECT id, handler, data FROM jobs ORDER BY id"
+        ):
+            try:
+                jobs.append(BroadcastJob(handler, json.loads(data), id=job_id))
+            except Exception:
+                logger.exception(f"Invalid journal entry: {job_id=}")
+        return jobs
+
+    def flush(self) -> None:
+        if not self._deletes:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM jobs WHERE id = ?",
+                ((job_id,) for job_id in self._deletes),
+            )
+        self._deletes.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+
+class DeadLetterStore:
+    """재시도 횟수를 초과한 디스코드 전송을 보관하는 SQLite 저장소
+
+    경로를 지정하지 않으면 메모리에만 보관합니다.
+    """
+
+    def __init__(self, path: str | Path = "") -> None:
+        if path:
+            self.path = Path(path)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        else:
+            self.path = None
+            self._conn = sqlite3.connect(":memory:")
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS dead_letters ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "channel_id INTEGER NOT NULL, "
+            "content TEXT NOT NULL, "
+            "error TEXT NOT NULL DEFAULT '', "
+            "attempts INTEGER NOT NULL DEFAULT 0, "
+            "failed REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def add(
+        self, channel_id: int, content: str, error: str = "", attempts: int = 0
+    ) -> int:
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO dead_letters (channel_id, content, error, attempts, failed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (channel_id, content, error, attempts, time.time()),
+            )
+        return cursor.lastrowid or 0
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM dead_letters").fetchone()[0]
+
+    def entries(self, limit: int = 50, offset: int = 0) -> list[dict[str, Any]]:
+        rows = self._conn.execute(
+            "SELECT * FROM dead_letters ORDER BY id LIMIT ? OFFSET ?",
+            (limit, offset),
+        )
+        return [dict(row) for row in rows]
+
+    def pop(self, ids: Sequence[int] | None = None) -> list[dict[str, Any]]:
+        """보관중인 항목을 꺼내면서 삭제 (``ids`` 생략시 전체)"""
+        if ids is None:
+            rows = self._conn.execute("SELECT * FROM dead_letters ORDER BY id")
+        else:
+            placeholders = ",".join("?" * len(ids))
+            rows = self._conn.execute(
+                f"SELECT * FROM dead_letters WHERE id IN ({placeholders}) ORDER BY id",
+                tuple(ids),
+            )
+        popped = [dict(row) for row in rows]
+        self.delete([entry["id"] for entry in popped])
+        return popped
+
+    def delete(self, ids: Sequence[int] | None = None) -> int:
+        with self._conn:
+            if ids is None:
+                cursor = self._conn.execute("DELETE FROM dead_letters")
+            else:
+                cursor = self._conn.executemany(
+                    "DELETE FROM dead_letters WHERE id = ?", ((i,) for i in ids)
+                )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class BroadcastQueue:
+    """우선순위별 대기열(lane)을 가중치에 따라 번갈아 꺼내는 방송 작업 대기열"""
+
+    def __init__(
+        self,
+        settings: BroadcastQueueConfig | None = None,
+        journal: BroadcastJournal | None = None,
+    ) -> None:
+        self.settings = settings or BroadcastQueueConfig()
+        self.journal = journal
+        self._lanes: dict[str, deque[BroadcastJob]] = {
+            lane: deque() for lane in self.settings.lanes
+        }
+        # smooth weighted round-robin 의 현재 가중치
+        self._current_weights: dict[str, int] = {lane: 0 for lane in self._lanes}
+        self._size = 0
+        self._unfinished = 0
+        self._not_empty = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._finished.set()
+        # 경로별로 가장 마지막에 들어온 대기 작업
+        self._latest: dict[tuple[str, str], BroadcastJob] = {}
+        self.coalesced = 0
+        self.rejected = 0
+        self.shed = 0
+        self.accepting = True
+
+    async def put(
+        self,
+        handler: str,
+        data: dict,
+        source: str = "",
+        priority: str | None = None,
+    ) -> BroadcastJob:
+        if not self.accepting:
+            raise QueueClosedError(
+                "Broadcast queue is closed", retry_after=self.settings.retry_after
+            )
+        job = BroadcastJob(handler, dict(data))
+        requested = priority or job.data.get("priority")
+        job.priority = self.settings.get_priority(
+            source,
+            str(job.data.get("mode") or ""),
+            str(requested) if requested else None,
+        )
+        latest = self._latest.get(job.key)
+        promote = False
+        if latest:
+            lanes = self.settings.lanes
+            if lanes[job.priority] > lanes[latest.priority]:
+                # 우선순위가 높은 요청이 오면 같은 경로의 대기 작업을 함께 올림
+                promote = True
+            else:
+                # 같은 경로의 작업은 같은 lane 에 넣어야 순서가 유지됨
+                job.priority = latest.priority
+        # 같은 경로의 마지막 대기 작업과 내용이 같을 때만 병합해야 순서가 유지됨
+        if latest and latest.extra.upper() == job.extra.upper():
+            if promote:
+                self._promote(job.key, latest.priority, job.priority)
+            latest.merge(job)
+            if self.journal:
+                self.journal.update(latest)
+            self.coalesced += 1
+            logger.debug(
+                f"Coalesced broadcast: handler={handler} path={job.path} extra={job.extra}"
+            )
+            return latest
+        self._admit(job)
+        # 거부된 요청이 대기 작업의 순서를 바꾸지 않도록 받은 뒤에 올림
+        # (자리를 확보하면서 같은 경로의 작업이 버려졌을 수 있으므로 다시 확인)
+        if promote and (latest := self._latest.get(job.key)):
+            self._promote(job.key, latest.priority, job.priority)
+        job.data["priority"] = job.priority
+        if self.journal:
+            job.id = self.journal.append(job)
+        self._latest[job.key] = job
+        self._append(job)
+        return job
+
+    async def get(self) -> BroadcastJob:
+        while not self._size:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        job = self._pop()
+        if self._latest.get(job.key) is job:
+            del self._latest[job.key]
+        return job
+
+    def task_done(self) -> None:
+        if self._unfinished <= 0:
+            raise ValueError("task_done() called too many times")
+        self._unfinished -= 1
+        if not self._unfinished:
+            self._finished.set()
+
+    def ack(self, job: BroadcastJob) -> None:
+        if self.journal:
+            self.journal.ack(job)
+
+    def replay(self) -> int:
+        """저널에 남아있는 미전송 작업을 대기열에 다시 넣음"""
+        if not self.journal:
+            return 0
+        jobs = self.journal.pending()
+        self._restore(jobs)
+        if jobs:
+            logger.info(f"Replayed {len(jobs)} pending broadcast job(s).")
+        return len(jobs)
+
+    def take_pending(self) -> list[BroadcastJob]:
+        """대기 중인 작업을 모두 꺼냄 (처리 완료로 간주)"""
+        jobs = sorted(
+            (job for jobs in self._lanes.values() for job in jobs),
+            key=lambda job: job.created,
+        )
+        for jobs_in_lane in self._lanes.values():
+            jobs_in_lane.clear()
+        self._latest.clear()
+        self._size = 0
+        for _ in jobs:
+            self.task_done()
+        return jobs
+
+    def spill(self, path: str | Path, jobs: Sequence[BroadcastJob]) -> int:
+        """처리하지 못한 작업을 파일로 저장 (다음 실행시 ``load_spill()`` 로 복구)"""
+        if not jobs:
+            return 0
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(f"{path.name}.tmp")
+        with temp.open("w", encoding="utf-8") as file:
+            if path.exists():
+                file.write(path.read_text(encoding="utf-8"))
+            for job in jobs:
+                line = json.dumps(
+                    {"handler": job.handler, "data": job.data},
+                    ensure_ascii=False,
+                    default=str,
+                )
+                file.write(f"{line}\n")
+        temp.replace(path)
+        return len(jobs)
+
+    def load_spill(self, path: str | Path) -> int:
+        path = Path(path)
+        if not path.exists():
+            return 0
+        jobs = []
+        with path.open(encoding="utf-8") as file:
+            for line in file:
+                if not (line := line.strip()):
+                    continue
+                try:
+                    entry = json.loads(line)
+                    jobs.append(BroadcastJob(entry["handler"], entry["data"]))
+                except Exception:
+                    logger.exception(f"Invalid spilled job: {line}")
+        if self.journal:
+            for job in jobs:
+                job.id = self.journal.append(job)
+            self.journal.flush()
+        self._restore(jobs)
+        path.unlink()
+        logger.info(f"Loaded {len(jobs)} spilled broadcast job(s): {path}")
+        return len(jobs)
+
+    async def run_flusher(self, interval: float = 1.0) -> None:
+        if not self.journal:
+            return
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                self.journal.flush()
+        finally:
+            self.journal.flush()
+
+    def close(self) -> None:
+        if self.journal:
+            self.journal.close()
+            self.journal = None
+
+    @property
+    def unfinished(self) -> int:
+        return self._unfinished
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "accepting": self.accepting,
+            "depth": self.qsize(),
+            "max_depth": self.settings.max_depth,
+            "high_water": self.settings.high_water,
+            "lanes": {lane: len(jobs) for lane, jobs in self._lanes.items()},
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+            "shed": self.shed,
+        }
+
+    def qsize(self) -> int:
+        return self._size
+
+    def empty(self) -> bool:
+        return not self._size
+
+    async def join(self) -> None:
+        if self._unfinished:
+            await self._finished.wait()
+
+    def _admit(self, job: BroadcastJob) -> None:
+        """대기열 한도를 확인하고 필요하면 다른 작업을 버려서 자리를 확보
+
+        - ``high_water`` 이상: 최우선 lane 작업만 받음 (429)
+        - ``max_depth`` 이상: ``shed_policy`` 에 따라 작업을 버리거나 거부 (503)
+        """
+        settings = self.settings
+        if settings.max_depth <= 0 or self._size < settings.max_depth:
+            if (
+                settings.high_water > 0
+                and self._size >= settings.high_water
+                and job.priority != settings.top_priority
+            ):
+                self._reject(job, 429)
+            return
+        victim = None
+        if settings.shed_policy == "oldest":
+            heads = [jobs[0] for jobs in self._lanes.values() if jobs]
+            victim = min(heads, key=lambda x: x.created, default=None)
+        elif settings.shed_policy == "lowest":
+            weights = settings.lanes
+            lowest = min(
+                (lane for lane, jobs in self._lanes.items() if jobs),
+                key=lambda lane: weights[lane],
+                default=None,
+            )
+            if lowest and weights[lowest] <= weights[job.priority]:
+                victim = self._lanes[lowest][0]
+        if victim is None:
+            self._reject(job, 503)
+        self._discard(victim)
+
+    def _reject(self, job: BroadcastJob, status: int) -> None:
+        self.rejected += 1
+        logger.warning(
+            f"Broadcast queue is full: depth={self._size} handler={job.handler} path={job.path}"
+        )
+        raise QueueFullError(
+            "Broadcast queue is full",
+            status=status,
+            retry_after=self.settings.retry_after,
+        )
+
+    def _discard(self, job: BroadcastJob) -> None:
+        self._lanes[job.priority].remove(job)
+        self._size -= 1
+        self.task_done()
+        if self.journal:
+            self.journal.ack(job)
+        if self._latest.get(job.key) is job:
+            del self._latest[job.key]
+            # 같은 경로의 이전 대기 작업이 있으면 그 작업을 기준으로 순서 유지
+            for pending in reversed(self._lanes[job.priority]):
+                if pending.key == job.key:
+                    self._latest[job.key] = pending
+                    break
+        self.shed += 1
+        logger.warning(
+            f"Shed broadcast: priority={job.priority} handler={job.handler} path={job.path}"
+        )
+
+    def _promote(self, key: tuple[str, str], source: str, target: str) -> None:
+        """``source`` lane 에 있는 경로의 대기 작업을 순서대로 ``target`` lane 뒤로 옮김"""
+        remained: deque[BroadcastJob] = deque()
+        for job in self._lanes[source]:
+            if job.key != key:
+                remained.append(job)
+                continue
+            job.priority = target
+            job.data["priority"] = target
+            self._lanes[target].append(job)
+            if self.journal:
+                self.journal.update(job)
+            logger.debug(
+                f"Promoted broadcast: {source} -> {target} handler={job.handler} path={job.path}"
+            )
+        self._lanes[source] = remained
+
+    def _restore(self, jobs: Sequence[BroadcastJob]) -> None:
+        for job in jobs:
+            requested = job.data.get("priority")
+            job.priority = self.settings.get_priority(
+                requested=str(requested) if requested else None
+            )
+            if latest := self._latest.get(job.key):
+                job.priority = latest.priority
+            self._latest[job.key] = job
+            self._append(job)
+
+    def _append(self, job: BroadcastJob) -> None:
+        self._lanes[job.priority].append(job)
+        self._size += 1
+        self._unfinished += 1
+        self._finished.clear()
+        self._not_empty.set()
+
+    def _pop(self) -> BroadcastJob:
+        total = 0
+        selected = None
+        for lane, jobs in self._lanes.items():
+            if not jobs:
+                continue
+            weight = max(self.settings.lanes[lane], 1)
+            self._current_weights[lane] += weight
+            total += weight
+            if (
+                selected is None
+                or self._current_weights[lane] > self._current_weights[selected]
+            ):
+                selected = lane
+        if selected is None:
+            raise IndexError("pop from an empty queue")
+        self._current_weights[selected] -= total
+        self._size -= 1
+        return self._lanes[selected].popleft()
@@ -0,0 +1,367 @@
+import time
+import random
+import logging
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import aiohttp
+import discord
+
+from .queues import DeadLetterStore
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """``per`` 초마다 ``rate`` 개의 토큰이 채워지는 토큰 버킷"""
+
+    def __init__(self, rate: int = 5, per: float = 5.0) -> None:
+        self.capacity = max(rate, 1)
+        self.per = max(per, 0.001)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        self.tokens = min(
+            self.capacity, self.tokens + elapsed * self.capacity / self.per
+        )
+        self.updated = now
+
+    def delay(self) -> float:
+        """토큰을 얻기까지 기다려야 하는 시간(초)"""
+        now = time.monotonic()
+        self._refill(now)
+        wait = max(self.blocked_until - now, 0.0)
+        if self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) * self.per / self.capacity)
+        return wait
+
+    async def acquire(self) -> None:
+        while (wait := self.delay()) > 0:
+            await asyncio.sleep(wait)
+        self.tokens -= 1
+
+    def pause(self, seconds: float) -> None:
+        """디스코드가 알려준 제한 시간 동안 토큰 지급을 중단"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = min(self.tokens, 0.0)
+
+
+@dataclass(slots=True, eq=False)
+class OutgoingMessage:
+    """채널로 보낼 메시지와 전송 결과"""
+
+    content: str
+    future: asyncio.Future
+    attempts: int = 0
+    error: str = ""
+    # 전송 순서를 지켜야 하는 메시지끼리 같은 값 (방송 작업의 key)
+    key: Any = None
+
+
+class ChannelSender:
+    """채널 하나의 전송 대기열을 순서대로 처리
+
+    전송에 실패한 메시지는 지연 시간을 늘려가며 타이머로 다시 대기열에 넣고
+    그 동안 다음 메시지를 계속 전송합니다. 단, 재시도 중인 메시지와 ``key`` 가
+    같은 메시지는 재시도가 끝날 때까지 보류해서 순서를 유지합니다.
+    """
+
+    RETRYABLE_ERRORS = (
+        discord.DiscordServerError,
+        aiohttp.ClientError,
+        asyncio.TimeoutError,
+        OSError,
+    )
+
+    def __init__(
+        self,
+        scheduler: "SendScheduler",
+        channel_id: int,
+        bucket: TokenBucket,
+    ) -> None:
+        self.scheduler = scheduler
+        self.channel_id = channel_id
+        self.bucket = bucket
+        self.queue: deque[OutgoingMessage] = deque()
+        self.task: asyncio.Task | None = None
+        self.sent = 0
+        self.failed = 0
+        self.retrying = 0
+        self.last_latency = 0.0
+        self._not_empty = asyncio.Event()
+        self._timers: set[asyncio.TimerHandle] = set()
+        self._retry_messages: dict[int, OutgoingMessage] = {}
+        # key 별로 재시도 중인 메시지와 그 뒤로 보류된 메시지
+        self._blockers: dict[Any, OutgoingMessage] = {}
+        self._held: dict[Any, deque[OutgoingMessage]] = {}
+
+    def start(self) -> None:
+        if not self.task or self.task.done():
+            self.task = asyncio.create_task(
+                self.run(), name=f"channel_sender_{self.channel_id}"
+            )
+
+    def submit(self, content: str, key: Any = None) -> asyncio.Future:
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        self._enqueue(OutgoingMessage(content, future, key=key))
+        self.start()
+        return future
+
+    async def run(self) -> None:
+        while True:
+            while not self.queue:
+                self._not_empty.clear()
+                await self._not_empty.wait()
+            message = self.queue.popleft()
+            if message.future.done():
+                self._release(message)
+                continue
+            if self._hold(message):
+                continue
+            try:
+                await self._attempt(message)
+            except asyncio.CancelledError:
+                if not message.future.done():
+                    self.queue.appendleft(message)
+                raise
+            except Exception as e:
+                logger.exception(f"Channel sender failed: {self.channel_id}")
+                if not message.future.done():
+                    message.future.set_exception(e)
+            if message.future.done():
+                self._release(message)
+
+    async def stop(self) -> list[OutgoingMessage]:
+        """타이머와 태스크를 정리하고 아직 전송하지 못한 메시지를 반환"""
+        for timer in self._timers:
+            timer.cancel()
+        self._timers.clear()
+        if self.task and not self.task.done():
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+        pending = [*self._retry_messages.values()]
+        for held in self._held.values():
+            pending.extend(held)
+        pending.extend(self.queue)
+        pending = [message for message in pending if not message.future.done()]
+        self.queue.clear()
+        self._retry_messages.clear()
+        self._blockers.clear()
+        self._held.clear()
+        self.retrying = 0
+        return pending
+
+    @property
+    def held(self) -> int:
+        return sum(len(held) for held in self._held.values())
+
+    def _hold(self, message: OutgoingMessage) -> bool:
+        """같은 key 의 앞선 메시지가 재시도 중이면 그 뒤로 보류"""
+        if message.key is None:
+            return False
+        blocker = self._blockers.get(message.key)
+        if blocker is None or blocker is message:
+            return False
+        self._held.setdefault(message.key, deque()).append(message)
+        return True
+
+    def _release(self, message: OutgoingMessage) -> None:
+        """전송이 끝난(성공, 실패) 메시지 뒤로 보류된 메시지를 대기열 앞에 넣음"""
+        if message.key is None or self._blockers.get(message.key) is not message:
+            return
+        del self._blockers[message.key]
+        if held := self._held.pop(message.key, None):
+            self.queue.extendleft(reversed(held))
+            self._not_empty.set()
+
+    def _enqueue(self, message: OutgoingMessage, front: bool = False) -> None:
+        if front:
+            self.queue.appendleft(message)
+        else:
+            self.queue.append(message)
+        self._not_empty.set()
+
+    async def _attempt(self, message: OutgoingMessage) -> None:
+        target_ch = self.scheduler.get_channel(self.channel_id)
+        if not target_ch:
+            # 로그인 직후에는 채널 캐시가 비어있을 수 있으므로 재시도
+            # (설정이 잘못된 채널이면 재시도 횟수를 넘긴 뒤 dead letter 로 보관)
+            message.attempts += 1
+            self._retry(message, "Channel not found")
+            return
+        await self.bucket.acquire()
+        message.attempts += 1
+        started = time.monotonic()
+        try:
+            await target_ch.send(message.content)
+        except discord.RateLimited as e:
+            logger.warning(
+                f"Rate limited on {self.channel_id}: retry after {e.retry_after:.2f}s"
+            )
+            self.bucket.pause(e.retry_after)
+            # 제한에 걸린 시도는 재시도 횟수에 포함하지 않음
+            message.attempts -= 1
+            self._enqueue(message, front=True)
+        except (discord.NotFound, discord.Forbidden) as e:
+            logger.error(f"Cannot send message to {self.channel_id}: {e}")
+            self.scheduler.forget_channel(self.channel_id)
+            self._fail(message, repr(e))
+        except self.RETRYABLE_ERRORS as e:
+            logger.error(
+                f"Failed to send message to {self.channel_id} ({message.attempts}/{self.scheduler.max_retries}): {e!r}"
+            )
+            self._retry(message, repr(e))
+        except Exception as e:
+            logger.exception(
+                f"An unexpected error occurred while sending to {self.channel_id}: content={message.content!r}"
+            )
+            self._fail(message, repr(e))
+        else:
+            self.last_latency = time.monotonic() - started
+            self.sent += 1
+            if not message.future.done():
+                message.future.set_result(True)
+
+    def _retry(self, message: OutgoingMessage, error: str) -> None:
+        message.error = error
+        if message.attempts >= self.scheduler.max_retries:
+            logger.error(f"Maximum retry count exceeded for {self.channel_id}.")
+            self._fail(message, error)
+            return
+        delay = self.scheduler.get_retry_delay(message.attempts)
+        logger.debug(f"Retry sending to {self.channel_id} in {delay:.2f}s")
+        self.retrying += 1
+        if message.key is not None:
+            self._blockers.setdefault(message.key, message)
+        loop = asyncio.get_running_loop()
+        timer: asyncio.TimerHandle | None = None
+
+        def requeue() -> None:
+            self._timers.discard(timer)
+            self._retry_messages.pop(id(message), None)
+            self.retrying -= 1
+            if message.future.done():
+                self._release(message)
+            else:
+                self._enqueue(message)
+
+        timer = loop.call_later(delay, requeue)
+        self._timers.add(timer)
+        self._retry_messages[id(message)] = message
+
+    def _fail(self, message: OutgoingMessage, error: str) -> None:
+        self.failed += 1
+        message.error = error
+        self.scheduler.dead_letter(self.channel_id, message)
+        if not message.future.done():
+            message.future.set_result(False)
+
+
+class SendScheduler:
+    """채널별 토큰 버킷으로 전송 속도를 조절하는 스케줄러
+
+    채널마다 별도의 대기열과 태스크를 사용하므로 한 채널이 제한에 걸려도
+    다른 채널의 전송은 지연되지 않습니다.
+    """
+
+    def __init__(
+        self,
+        resolver: Callable[[int], Any],
+        rate: int = 5,
+        per: float = 5.0,
+        max_retries: int = 3,
+        retry_delay: float = 5.0,
+        retry_max_delay: float = 300.0,
+        dead_letters: DeadLetterStore | None = None,
+    ) -> None:
+        self.resolver = resolver
+        self.rate = rate
+        self.per = per
+        self.max_retries = max(max_retries, 1)
+        self.retry_delay = retry_delay
+        self.retry_max_delay = retry_max_delay
+        self.dead_letters = dead_letters or DeadLetterStore()
+        self.senders: dict[int, ChannelSender] = {}
+        self._channels: dict[int, discord.abc.Messageable] = {}
+
+    def get_channel(self, channel_id: int) -> discord.abc.Messageable | None:
+        if channel := self._channels.get(channel_id):
+            return channel
+        target_ch = self.resolver(channel_id)
+        if not target_ch:
+            logger.warning(f"Channel {channel_id} not found.")
+            return None
+        if not isinstance(target_ch, discord.abc.Messageable):
+            logger.warning(f"Channel {channel_id} is not messageable.")
+            return None
+        self._channels[channel_id] = target_ch
+        return target_ch
+
+    def forget_channel(self, channel_id: int) -> None:
+        self._channels.pop(channel_id, None)
+
+    def get_sender(self, channel_id: int) -> ChannelSender:
+        if not (sender := self.senders.get(channel_id)):
+            sender = self.senders[channel_id] = ChannelSender(
+                self, channel_id, TokenBucket(self.rate, self.per)
+            )
+        return sender
+
+    def get_retry_delay(self, attempts: int) -> float:
+        """지수 백오프에 지터를 적용한 재시도 지연 시간(초)"""
+        delay = min(self.retry_max_delay, self.retry_delay * 2 ** max(attempts - 1, 0))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def submit(self, content: str, channel_id: int, key: Any = None) -> asyncio.Future:
+        """전송을 예약하고 최종 전송 결과를 받을 Future 를 반환
+
+        ``key`` 가 같은 메시지는 재시도가 있어도 채널별로 예약한 순서대로 전송됩니다.
+        """
+        return self.get_sender(channel_id).submit(content, key)
+
+    async def send(self, content: str, channel_id: int) -> bool:
+        return await self.submit(content, channel_id)
+
+    def dead_letter(self, channel_id: int, message: OutgoingMessage) -> None:
+        try:
+            self.dead_letters.add(
+                channel_id, message.content, message.error, message.attempts
+            )
+        except Exception:
+            logger.exception(f"Failed to store dead letter: {channel_id=}")
+
+    def replay_dead_letters(self, ids: list[int] | None = None) -> list[asyncio.Future]:
+        """보관된 전송 실패 메시지를 다시 전송 (실패하면 다시 보관됨)"""
+        entries = self.dead_letters.pop(ids)
+        if entries:
+            logger.info(f"Replaying {len(entries)} dead letter(s).")
+        return [self.submit(entry["content"], entry["channel_id"]) for entry in entries]
+
+    def stats(self) -> dict[int, dict[str, Any]]:
+        return {
+            channel_id: {
+                "pending": len(sender.queue),
+                "retrying": sender.retrying,
+                "held": sender.held,
+                "sent": sender.sent,
+                "failed": sender.failed,
+                "last_latency": round(sender.last_latency, 3),
+            }
+            for channel_id, sender in self.senders.items()
+        }
+
+    async def close(self) -> None:
+        for channel_id, sender in self.senders.items():
+            # 종료시까지 전송하지 못한 메시지는 다음 실행때 다시 보낼 수 있도록 보관
+            for message in await sender.stop():
+                if not message.future.done():
+                    message.error = message.error or "Cancelled on shutdown"
+                    self.dead_letter(channel_id, message)
+                    message.future.set_result(False)
+        self._channels.clear()
+        self.dead_letters.close()
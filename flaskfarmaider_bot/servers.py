@@ -3,10 +3,13 @@ import logging
 import inspect
 from typing import Any, Callable, Awaitable, Sequence, TypeVar, TYPE_CHECKING
 from functools import wraps
+from pathlib import Path
 
 from aiohttp import web
 
 from .models import APIConfig
+from .queues import QueueFullError
+from .helpers.helpers import get_int
 
 if TYPE_CHECKING:
     from .bot import FlaskfarmaiderBot
@@ -26,6 +29,17 @@ def route(path: str, method: str = "GET", auth_required: bool = True) -> Callabl
     return decorator
 
 
+def parse_ids(value: Any) -> list[int] | None:
+    """``[1, 2]`` 혹은 ``"1,2"`` 형식의 ID 목록, 값이 없으면 ``None``"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, (list, tuple)):
+        value = [value]
+    return [i for v in value if (i := get_int(v, default=0))]
+
+
 def validate_post_data(method):
     @wraps(method)
     async def wrapper(self, request: web.Request, *args, **kwds):
@@ -233,18 +247,194 @@ class FFaiderBotAPI(BotAPIServer):
             error_response["error"] = "Invalid values"
             return web.json_response(error_response, status=400)
         try:
-            await self.bot.broadcast_queue.put((app, data))
+            await self.bot.broadcast_queue.put(app, data, source="api")
+        except QueueFullError as e:
+            error_response["error"] = str(e)
+            return web.json_response(
+                error_response,
+                status=e.status,
+                headers={"Retry-After": str(e.retry_after)},
+            )
         except Exception:
             logger.exception("Broadcast failed")
             error_response["error"] = "Broadcast failed"
             return web.json_response(error_response, status=500)
         return web.Response(status=204)
 
+    @route("/api/broadcasts/queue", method="GET")
+    async def api_broadcast_queue(self, request: web.Request) -> web.Response:
+        data = self.bot.broadcast_queue.stats()
+        data["channels"] = self.bot.send_scheduler.stats()
+        return web.json_response({"result": "success", "data": data})
+
+    @route("/api/metadata/cache", method="GET")
+    async def api_metadata_cache(self, request: web.Request) -> web.Response:
+        data = (
+            self.bot.broadcast_service.cache_stats()
+            if self.bot.broadcast_service
+            else {}
+        )
+        return web.json_response({"result": "success", "data": data})
+
+    @route("/api/metadata/cache", method="DELETE")
+    async def api_clear_metadata_cache(self, request: web.Request) -> web.Response:
+        """``scope=all`` 이면 전체, 아니면 검색 결과가 없었던 항목만 삭제"""
+        if not self.bot.broadcast_service:
+            return web.json_response(
+                {"result": "error", "error": "Service is not ready"}, status=503
+            )
+        negative_only = request.query.get("scope", "negative") != "all"
+        count = self.bot.broadcast_service.clear_metadata_cache(negative_only)
+        return web.json_response({"result": "success", "data": {"deleted": count}})
+
+    @route("/api/metadata/title-index", method="POST")
+    @validate_post_data
+    async def api_load_title_index(
+        self, request: web.Request, data: dict
+    ) -> web.Response:
+        """``items`` 로 받은 목록이나 ``path`` 파일을 제목 색인에 추가
+
+        ``path`` 는 설정의 ``title_index.catalogs`` 에 있는 파일만 다시 불러올 수 있습니다.
+        """
+        service = self.bot.broadcast_service
+        if not service or service.title_index is None:
+            return web.json_response(
+                {"result": "error", "error": "Title index is disabled"}, status=503
+            )
+        items = data.get("items")
+        path = data.get("path")
+        if items is not None and not isinstance(items, list):
+            return web.json_response(
+                {"result": "error", "error": "Invalid values"}, status=400
+            )
+        if not items and path is not None:
+            catalogs = {
+                str(Path(catalog).resolve())
+                for catalog in self.bot.settings.broadcast.title_index.catalogs
+            }
+            if not isinstance(path, str) or str(Path(path).resolve()) not in catalogs:
+                return web.json_response(
+                    {"result": "error", "error": "path is not a configured catalog"},
+                    status=403,
+                )
+        source = items or path
+        if not source:
+            return web.json_response(
+                {"result": "error", "error": "items or path is required"}, status=400
+            )
+        try:
+            count = service.load_title_catalog(source)
+        except (OSError, ValueError) as e:
+            return web.json_response({"result": "error", "error": str(e)}, status=400)
+        return web.json_response({"result": "success", "data": {"loaded": count}})
+
+    @route("/api/broadcasts/dead-letters", method="GET")
+    async def api_dead_letters(self, request: web.Request) -> web.Response:
+        store = self.bot.send_scheduler.dead_letters
+        limit = get_int(request.query.get("limit"), default=50)
+        offset = get_int(request.query.get("offset"), default=0)
+        return web.json_response(
+            {
+                "result": "success",
+                "data": {
+                    "count": store.count(),
+                    "entries": store.entries(limit=limit, offset=offset),
+                },
+            }
+        )
+
+    @route("/api/broadcasts/dead-letters", method="DELETE")
+    async def api_delete_dead_letters(self, request: web.Request) -> web.Response:
+        ids = parse_ids(request.query.get("ids"))
+        deleted = self.bot.send_scheduler.dead_letters.delete(ids)
+        return web.json_response({"result": "success", "data": {"deleted": deleted}})
+
+    @route("/api/broadcasts/dead-letters/replay", method="POST")
+    @validate_post_data
+    async def api_replay_dead_letters(
+        self, request: web.Request, data: dict
+    ) -> web.Response:
+        ids = parse_ids(data.get("ids"))
+        futures = self.bot.send_scheduler.replay_dead_letters(ids)
+        return web.json_response(
+            {"result": "success", "data": {"replayed": len(futures)}}
+        )
+
     @route("/api/broadcasts/gds", method="POST")
     @validate_post_data
     async def api_broadcast_gds(self, request: web.Request, data: dict) -> web.Response:
         return await self._handle_broadcast(data, "gds", ("path", "mode"))
 
+    @route("/api/broadcasts/downloader/bulk", method="POST")
+    @validate_post_data
+    async def api_broadcast_downloader_bulk(
+        self, request: web.Request, data: dict | list
+    ) -> web.Response:
+        """여러 항목을 작품 폴더별로 묶어서 대기열에 넣고 항목별 결과를 반환
+
+        묶음 작업은 폴더 단위로 순서가 유지되므로 같은 파일을
+        ``/api/broadcasts/downloader`` 로 따로 보낸 작업과는 순서가 보장되지 않습니다.
+        """
+        items = data if isinstance(data, list) else data.get("items")
+        if not isinstance(items, list) or not items:
+            return web.json_response(
+                {"result": "error", "error": "Invalid values"}, status=400
+            )
+        if not self.bot.broadcast_service:
+            return web.json_response(
+                {"result": "error", "error": "Service is not ready"}, status=503
+            )
+        priority = None if isinstance(data, list) else data.get("priority")
+        results: list[dict] = []
+        groups: dict[str, list[int]] = {}
+        for idx, it in enumerate(items):
+            if not isinstance(it, dict):
+                it = {}
+            results.append({"path": it.get("path"), "item": it.get("item")})
+            if not isinstance(it.get("path"), str) or not it["path"] or not it.get("item"):
+                results[idx].update(accepted=False, error="Invalid values")
+                continue
+            results[idx]["accepted"] = True
+            group = self.bot.broadcast_service.get_group_path(it["path"])
+            groups.setdefault(group, []).append(idx)
+        rejected: QueueFullError | None = None
+        for group, indexes in groups.items():
+            job_data = {
+                "path": group,
+                "items": [
+                    {
+                        key: items[idx][key]
+                        for key in ("path", "item", "file_count", "total_size")
+                        if key in items[idx]
+                    }
+                    for idx in indexes
+                ],
+            }
+            if priority:
+                job_data["priority"] = priority
+            try:
+                await self.bot.broadcast_queue.put("downloader", job_data, source="api")
+            except QueueFullError as e:
+                rejected = e
+                for idx in indexes:
+                    results[idx].update(accepted=False, error=str(e))
+        accepted = sum(1 for result in results if result["accepted"])
+        body = {
+            "result": "success" if accepted else "error",
+            "data": {
+                "accepted": accepted,
+                "rejected": len(results) - accepted,
+                "items": results,
+            },
+        }
+        if not accepted and rejected:
+            return web.json_response(
+                body,
+                status=rejected.status,
+                headers={"Retry-After": str(rejected.retry_after)},
+            )
+        return web.json_response(body, status=200 if accepted else 400)
+
     @route("/api/broadcasts/downloader", method="POST")
     @validate_post_data
     async def api_broadcast_downloader(